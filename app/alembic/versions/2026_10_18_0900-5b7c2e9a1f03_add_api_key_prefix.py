@@ -0,0 +1,31 @@
+"""add api key prefix
+
+Revision ID: 5b7c2e9a1f03
+Revises: 81e77b50d882
+Create Date: 2026-10-18 09:00:12.104392
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b7c2e9a1f03'
+down_revision: Union[str, Sequence[str], None] = '81e77b50d882'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Существующие ключи остаются с prefix = NULL и проверяются по legacy-пути.
+    op.add_column('APIKey', sa.Column('prefix', sa.String(length=16), nullable=True))
+    op.create_index(op.f('ix_APIKey_prefix'), 'APIKey', ['prefix'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_APIKey_prefix'), table_name='APIKey')
+    op.drop_column('APIKey', 'prefix')
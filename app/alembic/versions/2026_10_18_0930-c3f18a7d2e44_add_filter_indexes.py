@@ -0,0 +1,37 @@
+"""add filter indexes
+
+Revision ID: c3f18a7d2e44
+Revises: 5b7c2e9a1f03
+Create Date: 2026-10-18 09:30:41.518207
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3f18a7d2e44'
+down_revision: Union[str, Sequence[str], None] = '5b7c2e9a1f03'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Индексы под фильтры списков (services/filters.py)
+    op.create_index(op.f('ix_APIKey_service_id'), 'APIKey', ['service_id'], unique=False)
+    op.create_index(op.f('ix_Payment_created_at'), 'Payment', ['created_at'], unique=False)
+    op.create_index('ix_Payment_user_id_created_at', 'Payment', ['user_id', 'created_at'], unique=False)
+    op.create_index(op.f('ix_UserService_service_id'), 'UserService', ['service_id'], unique=False)
+    op.create_index(op.f('ix_UserSubscription_subscription_id'), 'UserSubscription', ['subscription_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_UserSubscription_subscription_id'), table_name='UserSubscription')
+    op.drop_index(op.f('ix_UserService_service_id'), table_name='UserService')
+    op.drop_index('ix_Payment_user_id_created_at', table_name='Payment')
+    op.drop_index(op.f('ix_Payment_created_at'), table_name='Payment')
+    op.drop_index(op.f('ix_APIKey_service_id'), table_name='APIKey')
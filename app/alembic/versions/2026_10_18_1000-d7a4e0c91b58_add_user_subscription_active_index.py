@@ -0,0 +1,29 @@
+"""add user subscription active index
+
+Revision ID: d7a4e0c91b58
+Revises: c3f18a7d2e44
+Create Date: 2026-10-18 10:00:27.903115
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd7a4e0c91b58'
+down_revision: Union[str, Sequence[str], None] = 'c3f18a7d2e44'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Подсчёт активных подписок (всего и по тарифу) — index-only scan вместо seq scan
+    op.create_index('ix_UserSubscription_active_subscription_id', 'UserSubscription', ['active', 'subscription_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_UserSubscription_active_subscription_id', table_name='UserSubscription')
@@ -0,0 +1,42 @@
+"""add row version
+
+Revision ID: e2b9c4f7a613
+Revises: d7a4e0c91b58
+Create Date: 2026-10-18 10:30:09.264871
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2b9c4f7a613'
+down_revision: Union[str, Sequence[str], None] = 'd7a4e0c91b58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = (
+    'Admin',
+    'APIKey',
+    'Payment',
+    'Service',
+    'Subscription',
+    'User',
+    'UserService',
+    'UserSubscription',
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Версия строки для ETag; server_default заполняет существующие строки без перезаписи таблицы
+    for table in TABLES:
+        op.add_column(table, sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in TABLES:
+        op.drop_column(table, 'version')
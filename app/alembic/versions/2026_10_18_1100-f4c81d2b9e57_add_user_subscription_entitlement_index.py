@@ -0,0 +1,39 @@
+"""add user subscription entitlement index
+
+Revision ID: f4c81d2b9e57
+Revises: e2b9c4f7a613
+Create Date: 2026-10-18 11:00:41.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4c81d2b9e57'
+down_revision: Union[str, Sequence[str], None] = 'e2b9c4f7a613'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Проверка доступа пользователя к тарифу одним EXISTS: частичный индекс только по активным подпискам
+    op.create_index(
+        'ix_UserSubscription_entitlement',
+        'UserSubscription',
+        ['user_id', 'subscription_id', 'expires_at'],
+        unique=False,
+        postgresql_where=sa.text('active'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        'ix_UserSubscription_entitlement',
+        table_name='UserSubscription',
+        postgresql_where=sa.text('active'),
+    )
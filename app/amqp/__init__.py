@@ -7,7 +7,11 @@ from .users.subscribers import broker as user_broker
 from .subscriptions.subscribers import broker as subscriptions_broker
 from .payment.payment import broker as payment_broker
 from .queues import broker as queues_broker, PAYMENT_RECEIVED, USER_UPDATED, USER_REGISTERED, SUBSCRIPTON_CREATED
-main_broker = RabbitBroker(url=settings.rabbit_url)
+from .middlewares import ServiceAuthMiddleware, SQLTimingMiddleware
+# SQLTimingMiddleware — внешний, чтобы учитывать и запросы проверки API-ключа
+main_broker = RabbitBroker(
+    url=settings.rabbit_url, middlewares=(SQLTimingMiddleware, ServiceAuthMiddleware)
+)
 
 main_broker.include_router(queues_broker)
 main_broker.include_router(user_broker)
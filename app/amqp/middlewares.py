@@ -0,0 +1,75 @@
+from typing import Any
+
+from faststream import BaseMiddleware, context
+from faststream.broker.message import StreamMessage
+from faststream.types import AsyncFuncAny
+
+from contracts.amqp import MessageEnvelope, ServiceContext
+from core.database import amqp_database, read_your_writes_scope
+from core.instrumentation import collect_queries, log_query_stats
+from services.API_keys.crud import resolve_api_key
+from services.amqp_error_handler import AMQPErrorHandler
+from services.exceptions import APIKeyException
+from .queues import DLX
+
+
+class ServiceAuthMiddleware(BaseMiddleware):
+    """
+    💡 Авторизация AMQP-сообщений на уровне брокера.
+
+    Один раз разбирает meta сообщения и проверяет API-ключ (одна проверка или
+    попадание в кеш на сообщение). Невалидные сообщения отклоняются (в DLQ)
+    до вызова обработчика. Для валидных в контекст кладётся ServiceContext,
+    доступный обработчикам через Context("service").
+    """
+
+    async def consume_scope(
+        self,
+        call_next: AsyncFuncAny,
+        msg: StreamMessage[Any],
+    ) -> Any:
+        # Сообщения из DLX — уже отклонённые, их не авторизуем повторно
+        if getattr(msg.raw_message, "exchange", None) == DLX.name:
+            return await call_next(msg)
+
+        try:
+            envelope = MessageEnvelope.model_validate(await msg.decode())
+            async with amqp_database.session_maker() as session:
+                api_key_id = await resolve_api_key(
+                    key=envelope.meta.api_key,
+                    service_id=envelope.meta.service_id,
+                    session=session,
+                )
+            if api_key_id is None:
+                raise APIKeyException("Invalid APIKey")
+        except Exception as err:
+            await msg.nack(requeue=False)
+            AMQPErrorHandler.handle(err=err)
+            return None
+
+        service = ServiceContext(
+            service_id=envelope.meta.service_id, api_key_id=api_key_id
+        )
+        # read-your-writes — в пределах одного сообщения
+        with context.scope("service", service), read_your_writes_scope():
+            return await call_next(msg)
+
+
+class SQLTimingMiddleware(BaseMiddleware):
+    """
+    💡 SQL-статистика обработки AMQP-сообщения (включая проверку API-ключа):
+    количество запросов, суммарное время в БД и самый медленный запрос —
+    в лог 'sql' с именем очереди.
+    """
+
+    async def consume_scope(
+        self,
+        call_next: AsyncFuncAny,
+        msg: StreamMessage[Any],
+    ) -> Any:
+        queue = getattr(msg.raw_message, "routing_key", None) or "amqp"
+        with collect_queries() as stats:
+            try:
+                return await call_next(msg)
+            finally:
+                log_query_stats(stats, unit=f"AMQP {queue}")
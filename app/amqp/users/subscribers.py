@@ -1,5 +1,7 @@
+from faststream import Context
 from faststream.rabbit.broker import RabbitBroker
 from config import settings
+from contracts.amqp import ServiceContext
 from services.user.user_registered import register_new_user
 from services.user.user_updated import update_user_by_chat_id
 from faststream.rabbit import RabbitMessage
@@ -9,9 +11,11 @@ broker = RabbitBroker(url=settings.rabbit_url)
 
 
 @broker.subscriber(USER_REGISTERED, no_ack=True)
-async def register_new_user_handler(message: RabbitMessage):
-    await register_new_user(msg=message)
+async def register_new_user_handler(
+    message: RabbitMessage, service: ServiceContext = Context("service")
+):
+    await register_new_user(msg=message, service=service)
 
 @broker.subscriber(USER_UPDATED, no_ack=True)
 async def update_user_by_chat_id_handler(message: RabbitMessage):
-    await update_user_by_chat_id(msg=message)
\ No newline at end of file
+    await update_user_by_chat_id(msg=message)
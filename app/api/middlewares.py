@@ -0,0 +1,37 @@
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from core.instrumentation import collect_queries, log_query_stats
+
+
+class SQLTimingMiddleware:
+    """
+    💡 SQL-статистика HTTP-запроса: количество запросов, суммарное время в БД
+    и самый медленный запрос.
+
+    Отдаётся заголовком Server-Timing (видно в DevTools браузера) и пишется
+    в лог 'sql' после ответа. Чистый ASGI-middleware, а не BaseHTTPMiddleware:
+    view выполняется в той же задаче, поэтому ContextVar статистики ему виден.
+    Запросы потоковых (NDJSON) ответов попадают в лог, но не в заголовок:
+    он уходит клиенту раньше.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with collect_queries() as stats:
+
+            async def send_with_timing(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    MutableHeaders(scope=message).append("Server-Timing", stats.server_timing())
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_timing)
+            finally:
+                log_query_stats(stats, unit=f"{scope['method']} {scope['path']}")
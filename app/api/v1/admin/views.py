@@ -1,12 +1,16 @@
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, Path, status
+from fastapi import APIRouter, Body, Depends, Path, Query, Request, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from services import CRUD, create_admin
+from services import CRUD, loader_options, create_admin, create_many_admins, authenticate_admin
 from core.models import Admin
-from contracts.admin import AdminReturn, AdminUpdate, AdminCreateForm
+from contracts.admin import AdminReturn, AdminUpdate, AdminCreateForm, AdminLoginForm
 from core.database import database
+from contracts.pagination import Page, PageParams, CountReturn, CountParams
+from contracts.bulk import OnConflict, MAX_BULK_SIZE
+from services.streaming import NDJSON_RESPONSE, accepts_ndjson, ndjson_response
 
 router = APIRouter(
     prefix="/admins",
@@ -15,6 +19,8 @@ router = APIRouter(
 )
 
 SessionDep = Annotated[AsyncSession, Depends(database.get_session)]
+# чтение — из реплики (если настроена), см. DataBaseHelper.read_session
+ReadSessionDep = Annotated[AsyncSession, Depends(database.get_read_session)]
 
 
 @router.post(
@@ -38,20 +44,94 @@ async def create_admin_view(
     return admin
 
 
+@router.post(
+    "/login",
+    response_model=AdminReturn,
+    summary="Вход администратора (dev)",
+    response_model_exclude_none=True,
+)
+async def login_admin_view(
+    data: AdminLoginForm,
+    session: SessionDep,
+) -> AdminReturn:
+    """
+    ⚙️ **Dev-only endpoint**
+
+    Проверяет email и пароль администратора.
+    Устаревший хеш пароля пересчитывается с текущими параметрами argon2.
+    """
+    return await authenticate_admin(form=data, session=session)
+
+
+@router.post(
+    "/bulk",
+    response_model=list[AdminReturn],
+    status_code=status.HTTP_201_CREATED,
+    summary="Создать администраторов пачкой (dev)",
+    response_model_exclude_none=True,
+)
+async def create_admins_bulk_view(
+    data: Annotated[
+        list[AdminCreateForm], Body(min_length=1, max_length=MAX_BULK_SIZE)
+    ],
+    session: SessionDep,
+    on_conflict: Annotated[
+        OnConflict, Query(description="Поведение при конфликте по email")
+    ] = OnConflict.error,
+) -> list[AdminReturn]:
+    """
+    ⚙️ **Dev-only endpoint**
+
+    Создаёт администраторов одним INSERT (пароли хешируются параллельно).
+    """
+    return await create_many_admins(forms=data, session=session, on_conflict=on_conflict)
+
+
+@router.get(
+    "/count",
+    response_model=CountReturn,
+    summary="Количество администраторов (dev)",
+)
+async def count_admins_view(
+    session: ReadSessionDep,
+    params: Annotated[CountParams, Query()],
+) -> CountReturn:
+    """
+    ⚙️ **Dev-only endpoint**
+
+    Возвращает количество администраторов.
+    `approximate=true` без фильтров — быстрая оценка по статистике PostgreSQL.
+    """
+    return await CRUD.count(
+        model=Admin, session=session, approximate=params.approximate
+    )
+
+
 @router.get(
     "/",
-    response_model=list[AdminReturn],
+    response_model=Page[AdminReturn],
     summary="Получить список всех администраторов (dev)",
+    responses=NDJSON_RESPONSE,
     response_model_exclude_none=True,
 )
-async def get_admins_list_view(session: SessionDep) -> list[AdminReturn]:
+async def get_admins_list_view(
+    request: Request,
+    session: ReadSessionDep,
+    page: Annotated[PageParams, Query()],
+) -> Page[AdminReturn] | StreamingResponse:
     """
     ⚙️ **Dev-only endpoint**
 
     Возвращает список всех администраторов из базы данных.
     Удобно для просмотра зарегистрированных аккаунтов панели управления.
+    Постраничный вывод: keyset-пагинация по id, курсор следующей страницы — в next_cursor.
+    С заголовком `Accept: application/x-ndjson` — все записи потоком (NDJSON), без пагинации.
     """
-    return await CRUD.get(model=Admin, session=session)
+    if accepts_ndjson(request):
+        return ndjson_response(
+            model=Admin, schema=AdminReturn, options=loader_options(Admin)
+        )
+    return await CRUD.get(model=Admin, session=session, page=page)
 
 
 @router.get(
@@ -62,7 +142,7 @@ async def get_admins_list_view(session: SessionDep) -> list[AdminReturn]:
 )
 async def get_admin_by_id_view(
     id: Annotated[int, Path(description="Идентификатор администратора")],
-    session: SessionDep,
+    session: ReadSessionDep,
 ) -> AdminReturn:
     """
     ⚙️ **Dev-only endpoint**
@@ -109,4 +189,4 @@ async def delete_admin_view(
     Удаляет администратора по его ID.
     Применяется при тестировании или чистке базы данных.
     """
-    return await CRUD.delete(id=id, session=session, model=Admin)
+    return await CRUD.delete(id=id, session=session, model=Admin, db_cascade=True)
@@ -1,13 +1,18 @@
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, Path, status
+from fastapi import APIRouter, Body, Depends, Path, Query, Request, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from services import CRUD
+from services import CRUD, loader_options
 from core.models import APIKey
-from contracts.api_keys import APIKeyReturn, APIKeyUpdate, APIKeyCreateForm
+from contracts.api_keys import APIKeyReturn, APIKeyUpdate, APIKeyCreateForm, APIKeyListParams, APIKeyCountParams
 from core.database import database
-from services.API_keys.crud import create_key, check_valid_api_key
+from contracts.pagination import Page, CountReturn
+from contracts.bulk import MAX_BULK_SIZE
+from services.streaming import NDJSON_RESPONSE, accepts_ndjson, ndjson_response
+from core.cache import invalidate_api_key
+from services.API_keys.crud import create_key, create_many_keys, check_valid_api_key
 
 router = APIRouter(
     prefix="/api-keys",
@@ -16,6 +21,8 @@ router = APIRouter(
 )
 
 SessionDep = Annotated[AsyncSession, Depends(database.get_session)]
+# чтение — из реплики (если настроена), см. DataBaseHelper.read_session
+ReadSessionDep = Annotated[AsyncSession, Depends(database.get_read_session)]
 
 
 @router.post(
@@ -39,20 +46,78 @@ async def create_api_key_view(
     return await create_key(data, session)
 
 
+@router.post(
+    "/bulk",
+    response_model=list[str],
+    status_code=status.HTTP_201_CREATED,
+    summary="Создать API-ключи пачкой (dev)",
+    response_model_exclude_none=True,
+)
+async def create_api_keys_bulk_view(
+    data: Annotated[
+        list[APIKeyCreateForm], Body(min_length=1, max_length=MAX_BULK_SIZE)
+    ],
+    session: SessionDep,
+) -> list[str]:
+    """
+    ⚙️ **Dev-only endpoint**
+
+    Создаёт API-ключи одним INSERT и возвращает их в порядке запроса.
+    Ключи генерируются заново, поэтому конфликтов не бывает.
+    """
+    return await create_many_keys(forms=data, session=session)
+
+
+@router.get(
+    "/count",
+    response_model=CountReturn,
+    summary="Количество API-ключей (dev)",
+)
+async def count_api_keys_view(
+    session: ReadSessionDep,
+    params: Annotated[APIKeyCountParams, Query()],
+) -> CountReturn:
+    """
+    ⚙️ **Dev-only endpoint**
+
+    Возвращает количество API-ключей (с теми же фильтрами, что и список).
+    `approximate=true` без фильтров — быстрая оценка по статистике PostgreSQL.
+    """
+    return await CRUD.count(
+        model=APIKey, session=session, filters=params, approximate=params.approximate
+    )
+
+
 @router.get(
     "/",
-    response_model=list[APIKeyReturn],
+    response_model=Page[APIKeyReturn],
     summary="Получить список всех API-ключей (dev)",
+    responses=NDJSON_RESPONSE,
     response_model_exclude_none=True,
 )
-async def get_api_keys_list_view(session: SessionDep) -> list[APIKeyReturn]:
+async def get_api_keys_list_view(
+    request: Request,
+    session: ReadSessionDep,
+    params: Annotated[APIKeyListParams, Query()],
+) -> Page[APIKeyReturn] | StreamingResponse:
     """
     ⚙️ **Dev-only endpoint**
 
     Возвращает список всех существующих API-ключей.
     Удобно для ручной проверки активных ключей и их связей с сервисами.
+    Постраничный вывод: keyset-пагинация, курсор следующей страницы — в next_cursor.
+    Фильтры: service_id, is_active; сортировка — sort.
+    Фильтровать можно только по индексированным полям (остальные — лишь в паре с ними).
+    С заголовком `Accept: application/x-ndjson` — все записи потоком (NDJSON), без пагинации.
     """
-    return await CRUD.get(model=APIKey, session=session)
+    if accepts_ndjson(request):
+        return ndjson_response(
+            model=APIKey,
+            schema=APIKeyReturn,
+            options=loader_options(APIKey),
+            filters=params,
+        )
+    return await CRUD.get(model=APIKey, session=session, page=params, filters=params)
 
 
 @router.get(
@@ -63,7 +128,7 @@ async def get_api_keys_list_view(session: SessionDep) -> list[APIKeyReturn]:
 )
 async def get_api_key_by_id_view(
     id: Annotated[int, Path(description="Идентификатор API-ключа")],
-    session: SessionDep,
+    session: ReadSessionDep,
 ) -> APIKeyReturn:
     """
     ⚙️ **Dev-only endpoint**
@@ -92,7 +157,9 @@ async def patch_api_key_view(
     например, описание, срок действия или статус активности.
     Используется при управлении правами доступа.
     """
-    return await CRUD.patch(new_data=new_data, model=APIKey, session=session, id=id)
+    api_key = await CRUD.patch(new_data=new_data, model=APIKey, session=session, id=id)
+    invalidate_api_key(api_key_id=id, service_id=api_key.service_id)
+    return api_key
 
 
 @router.delete(
@@ -111,7 +178,9 @@ async def delete_api_key_view(
     Удаляет API-ключ по его ID.
     Применяется при тестировании или отзыве неиспользуемых ключей.
     """
-    return await CRUD.delete(id=id, session=session, model=APIKey)
+    result = await CRUD.delete(id=id, session=session, model=APIKey, db_cascade=True)
+    invalidate_api_key(api_key_id=id)
+    return result
 
 
 @router.get(
@@ -0,0 +1,94 @@
+from fastapi import APIRouter, status
+
+from contracts.internal import HasherMetricsReturn, APIKeyAuthMetricsReturn, DatabasePoolReturn, SlowQueryReturn
+from core.cache import api_key_cache, api_key_failures
+from core.database import database_pools
+from core.instrumentation import slow_queries
+from core.security import hash_executor
+
+router = APIRouter(
+    prefix="/internal",
+    tags=["Internal (dev)"],
+    include_in_schema=True,  # можно скрыть из Swagger при деплое
+)
+
+
+@router.get(
+    "/hasher",
+    response_model=HasherMetricsReturn,
+    summary="Метрики пула хеширования (dev)",
+)
+async def get_hasher_metrics_view() -> HasherMetricsReturn:
+    """
+    ⚙️ **Dev-only endpoint**
+
+    Возвращает глубину очереди и время выполнения argon2 в пуле хеширования.
+    """
+    return HasherMetricsReturn(
+        executor=hash_executor.kind,
+        workers=hash_executor.workers,
+        max_queue=hash_executor.max_queue,
+        max_waiting=hash_executor.max_waiting,
+        **hash_executor.metrics.snapshot(),
+    )
+
+
+@router.get(
+    "/api-keys",
+    response_model=APIKeyAuthMetricsReturn,
+    summary="Метрики проверки API-ключей (dev)",
+)
+async def get_api_key_auth_metrics_view() -> APIKeyAuthMetricsReturn:
+    """
+    ⚙️ **Dev-only endpoint**
+
+    Возвращает счётчики отклонённых и ограниченных (throttled) проверок API-ключей.
+    """
+    return APIKeyAuthMetricsReturn(
+        cached_keys=len(api_key_cache),
+        **api_key_failures.metrics.snapshot(),
+    )
+
+
+@router.get(
+    "/database",
+    response_model=list[DatabasePoolReturn],
+    summary="Метрики пулов соединений с БД (dev)",
+)
+async def get_database_pool_metrics_view() -> list[DatabasePoolReturn]:
+    """
+    ⚙️ **Dev-only endpoint**
+
+    Возвращает занятость пулов соединений API и AMQP (и их реплик) и время ожидания соединения.
+    Растущие timeouts и max_wait_seconds — сигнал увеличить пул или разгрузить БД.
+    """
+    return [DatabasePoolReturn(**db.pool_status()) for db in database_pools]
+
+
+@router.get(
+    "/slow-queries",
+    response_model=list[SlowQueryReturn],
+    summary="Журнал медленных запросов (dev)",
+)
+async def get_slow_queries_view() -> list[SlowQueryReturn]:
+    """
+    ⚙️ **Dev-only endpoint**
+
+    Возвращает последние запросы дольше slow_query_threshold_ms (новые первыми)
+    с формой параметров и планом EXPLAIN — видно, где seq scan вместо индекса.
+    """
+    return [SlowQueryReturn(**entry) for entry in slow_queries.snapshot()]
+
+
+@router.delete(
+    "/slow-queries",
+    status_code=status.HTTP_204_NO_CONTENT,
+    summary="Очистить журнал медленных запросов (dev)",
+)
+async def clear_slow_queries_view() -> None:
+    """
+    ⚙️ **Dev-only endpoint**
+
+    Очищает журнал — например, после добавления индекса, чтобы проверить результат.
+    """
+    slow_queries.clear()
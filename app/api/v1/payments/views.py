@@ -1,12 +1,16 @@
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, Path, status
+from fastapi import APIRouter, Body, Depends, Path, Query, Request, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from services import CRUD
+from services import CRUD, loader_options
 from core.models import Payment
-from contracts.payments import PaymentCreate, PaymentUpdate, PaymentReturn
+from contracts.payments import PaymentCreate, PaymentUpdate, PaymentReturn, PaymentListParams, PaymentCountParams
 from core.database import database
+from contracts.pagination import Page, CountReturn
+from contracts.bulk import MAX_BULK_SIZE
+from services.streaming import NDJSON_RESPONSE, accepts_ndjson, ndjson_response
 
 router = APIRouter(
     prefix="/payments",
@@ -15,6 +19,8 @@ router = APIRouter(
 )
 
 SessionDep = Annotated[AsyncSession, Depends(database.get_session)]
+# чтение — из реплики (если настроена), см. DataBaseHelper.read_session
+ReadSessionDep = Annotated[AsyncSession, Depends(database.get_read_session)]
 
 
 @router.post(
@@ -38,20 +44,79 @@ async def create_payment_view(
     return await CRUD.create(data=data, model=Payment, session=session)
 
 
+@router.post(
+    "/bulk",
+    response_model=list[PaymentReturn],
+    status_code=status.HTTP_201_CREATED,
+    summary="Создать платежи пачкой (dev)",
+    response_model_exclude_none=True,
+)
+async def create_payments_bulk_view(
+    data: Annotated[
+        list[PaymentCreate], Body(min_length=1, max_length=MAX_BULK_SIZE)
+    ],
+    session: SessionDep,
+) -> list[PaymentReturn]:
+    """
+    ⚙️ **Dev-only endpoint**
+
+    Создаёт платежи одним INSERT.
+    Используется для переноса или повторной загрузки платежей.
+    У платежей нет уникальных полей, поэтому конфликтов не бывает.
+    """
+    return await CRUD.create_many(data=data, model=Payment, session=session)
+
+
+@router.get(
+    "/count",
+    response_model=CountReturn,
+    summary="Количество платежей (dev)",
+)
+async def count_payments_view(
+    session: ReadSessionDep,
+    params: Annotated[PaymentCountParams, Query()],
+) -> CountReturn:
+    """
+    ⚙️ **Dev-only endpoint**
+
+    Возвращает количество платежей (с теми же фильтрами, что и список).
+    `approximate=true` без фильтров — быстрая оценка по статистике PostgreSQL.
+    """
+    return await CRUD.count(
+        model=Payment, session=session, filters=params, approximate=params.approximate
+    )
+
+
 @router.get(
     "/",
-    response_model=list[PaymentReturn],
+    response_model=Page[PaymentReturn],
     summary="Получить список всех платежей (dev)",
+    responses=NDJSON_RESPONSE,
     response_model_exclude_none=True,
 )
-async def get_payments_list_view(session: SessionDep) -> list[PaymentReturn]:
+async def get_payments_list_view(
+    request: Request,
+    session: ReadSessionDep,
+    params: Annotated[PaymentListParams, Query()],
+) -> Page[PaymentReturn] | StreamingResponse:
     """
     ⚙️ **Dev-only endpoint**
 
     Возвращает список всех зарегистрированных платежей.
     Полезно для тестирования финансовых транзакций и их связей с заказами.
+    Постраничный вывод: keyset-пагинация, курсор следующей страницы — в next_cursor.
+    Фильтры: user_id, период created_from/created_to, provider, succeeded; сортировка — sort.
+    Фильтровать можно только по индексированным полям (остальные — лишь в паре с ними).
+    С заголовком `Accept: application/x-ndjson` — все записи потоком (NDJSON), без пагинации.
     """
-    return await CRUD.get(model=Payment, session=session)
+    if accepts_ndjson(request):
+        return ndjson_response(
+            model=Payment,
+            schema=PaymentReturn,
+            options=loader_options(Payment),
+            filters=params,
+        )
+    return await CRUD.get(model=Payment, session=session, page=params, filters=params)
 
 
 @router.get(
@@ -62,7 +127,7 @@ async def get_payments_list_view(session: SessionDep) -> list[PaymentReturn]:
 )
 async def get_payment_by_id_view(
     id: Annotated[int, Path(description="Идентификатор платежа")],
-    session: SessionDep,
+    session: ReadSessionDep,
 ) -> PaymentReturn:
     """
     ⚙️ **Dev-only endpoint**
@@ -110,4 +175,4 @@ async def delete_payment_view(
     Удаляет платёж по его ID.
     Применяется при тестировании или очистке базы от старых записей.
     """
-    return await CRUD.delete(id=id, session=session, model=Payment)
+    return await CRUD.delete(id=id, session=session, model=Payment, db_cascade=True)
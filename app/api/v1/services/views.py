@@ -1,12 +1,18 @@
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, Path, status
+from fastapi import APIRouter, Body, Depends, Path, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from services import CRUD
+from services import CRUD, loader_options
 from core.models import Service
-from contracts.services import ServiceCreate, ServiceUpdate, ServiceReturn
+from contracts.services import ServiceCreate, ServiceUpdate, ServiceReturn, ServiceShortReturn
 from core.database import database
+from contracts.pagination import Page, PageParams, CountReturn, CountParams
+from contracts.bulk import OnConflict, MAX_BULK_SIZE
+from services.streaming import NDJSON_RESPONSE, accepts_ndjson, ndjson_response
+from services.etag import NOT_MODIFIED_RESPONSE, get_with_etag
+from core.cache import invalidate_service_api_keys
 
 router = APIRouter(
     prefix="/services",
@@ -15,6 +21,11 @@ router = APIRouter(
 )
 
 SessionDep = Annotated[AsyncSession, Depends(database.get_session)]
+# чтение — из реплики (если настроена), см. DataBaseHelper.read_session
+ReadSessionDep = Annotated[AsyncSession, Depends(database.get_read_session)]
+
+# вложенные коллекции ответа — их изменения меняют ETag
+SERVICE_ETAG_RELATIONSHIPS = ("api_keys",)
 
 
 @router.post(
@@ -37,39 +48,110 @@ async def create_service_view(
     return await CRUD.create(data=data, model=Service, session=session)
 
 
+@router.post(
+    "/bulk",
+    response_model=list[ServiceShortReturn],
+    status_code=status.HTTP_201_CREATED,
+    summary="Создать сервисы пачкой (dev)",
+    response_model_exclude_none=True,
+)
+async def create_services_bulk_view(
+    data: Annotated[
+        list[ServiceCreate], Body(min_length=1, max_length=MAX_BULK_SIZE)
+    ],
+    session: SessionDep,
+    on_conflict: Annotated[
+        OnConflict, Query(description="Поведение при конфликте по name")
+    ] = OnConflict.error,
+) -> list[ServiceShortReturn]:
+    """
+    ⚙️ **Dev-only endpoint**
+
+    Создаёт сервисы одним INSERT.
+    """
+    return await CRUD.create_many(
+        data=data, model=Service, session=session, on_conflict=on_conflict
+    )
+
+
+@router.get(
+    "/count",
+    response_model=CountReturn,
+    summary="Количество сервисов (dev)",
+)
+async def count_services_view(
+    session: ReadSessionDep,
+    params: Annotated[CountParams, Query()],
+) -> CountReturn:
+    """
+    ⚙️ **Dev-only endpoint**
+
+    Возвращает количество сервисов.
+    `approximate=true` без фильтров — быстрая оценка по статистике PostgreSQL.
+    """
+    return await CRUD.count(
+        model=Service, session=session, approximate=params.approximate
+    )
+
+
 @router.get(
     "/",
-    response_model=list[ServiceReturn],
+    response_model=Page[ServiceShortReturn],
     summary="Получить список всех сервисов (dev)",
+    responses=NDJSON_RESPONSE,
     response_model_exclude_none=True,
 )
-async def get_services_list_view(session: SessionDep) -> list[ServiceReturn]:
+async def get_services_list_view(
+    request: Request,
+    session: ReadSessionDep,
+    page: Annotated[PageParams, Query()],
+) -> Page[ServiceShortReturn] | StreamingResponse:
     """
     ⚙️ **Dev-only endpoint**
 
     Возвращает список всех зарегистрированных сервисов.
     Удобно для мониторинга и отладки интеграций.
+    Постраничный вывод: keyset-пагинация по id, курсор следующей страницы — в next_cursor.
+    Без вложенных API-ключей: они возвращаются в GET /services/{id}.
+    С заголовком `Accept: application/x-ndjson` — все записи потоком (NDJSON), без пагинации.
     """
-    return await CRUD.get(model=Service, session=session)
+    if accepts_ndjson(request):
+        return ndjson_response(
+            model=Service, schema=ServiceShortReturn, options=loader_options(Service)
+        )
+    return await CRUD.get(
+        model=Service, session=session, page=page, options=loader_options(Service)
+    )
 
 
 @router.get(
     "/{id:int}",
     response_model=ServiceReturn,
     summary="Получить сервис по ID (dev)",
+    responses=NOT_MODIFIED_RESPONSE,
     response_model_exclude_none=True,
 )
 async def get_service_by_id_view(
     id: Annotated[int, Path(description="Идентификатор сервиса")],
-    session: SessionDep,
-) -> ServiceReturn:
+    session: ReadSessionDep,
+    request: Request,
+    response: Response,
+) -> ServiceReturn | Response:
     """
     ⚙️ **Dev-only endpoint**
 
     Возвращает данные сервиса по указанному ID.
     Применяется при ручной проверке конкретной записи.
+    Поддерживает условный GET: ETag в ответе, If-None-Match → 304.
     """
-    return await CRUD.get(model=Service, session=session, id=id)
+    return await get_with_etag(
+        request=request,
+        response=response,
+        model=Service,
+        session=session,
+        id=id,
+        relationships=SERVICE_ETAG_RELATIONSHIPS,
+    )
 
 
 @router.patch(
@@ -89,7 +171,13 @@ async def patch_service_view(
     Частично обновляет данные сервиса — например, описание или владельца.
     Может использоваться при изменении структуры интеграций.
     """
-    return await CRUD.patch(new_data=new_data, model=Service, session=session, id=id)
+    return await CRUD.patch(
+        new_data=new_data,
+        model=Service,
+        session=session,
+        id=id,
+        options=loader_options(Service, api_keys="selectin"),
+    )
 
 
 @router.delete(
@@ -108,4 +196,6 @@ async def delete_service_view(
     Удаляет сервис по его ID.
     Применяется при тестировании или удалении устаревших интеграций.
     """
-    return await CRUD.delete(id=id, session=session, model=Service)
+    result = await CRUD.delete(id=id, session=session, model=Service, db_cascade=True)
+    invalidate_service_api_keys(service_id=id)
+    return result
@@ -1,19 +1,27 @@
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, Path, status
+from fastapi import APIRouter, Body, Depends, Path, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from services import CRUD
+from services import CRUD, loader_options
 from services.subscription.subscribe_user import subscribe, check_user_subscribe
-from core.models import Subscription
+from core.models import Subscription, UserSubscription
 from contracts.subscriptions import (
     SubscriptionCreate,
     SubscriptionReturn,
     SubscriptionUpdate,
     SubscribeUserReturn,
-    SubscribeUserCreateForm
+    SubscribeUserCreateForm,
+    SubscribeUserListParams,
+    SubscribeUserCountParams,
 )
 from core.database import database
+from contracts.pagination import Page, PageParams, CountReturn, CountParams
+from contracts.bulk import OnConflict, MAX_BULK_SIZE
+from services.streaming import NDJSON_RESPONSE, accepts_ndjson, ndjson_response
+from services.etag import NOT_MODIFIED_RESPONSE, get_with_etag
+from services.subscription.catalog import plan_catalog
 
 router = APIRouter(
     prefix="/subscriptions",
@@ -22,6 +30,8 @@ router = APIRouter(
 )
 
 SessionDep = Annotated[AsyncSession, Depends(database.get_session)]
+# чтение — из реплики (если настроена), см. DataBaseHelper.read_session
+ReadSessionDep = Annotated[AsyncSession, Depends(database.get_read_session)]
 
 
 @router.post(
@@ -42,41 +52,173 @@ async def create_subscription_view(
     Используется для ручного добавления тарифов (например, `pro_month`, `free`).
     """
     subscription = await CRUD.create(data=data, model=Subscription, session=session)
+    await plan_catalog.refresh_after_change()
     return subscription
 
 
+@router.post(
+    "/bulk",
+    response_model=list[SubscriptionReturn],
+    status_code=status.HTTP_201_CREATED,
+    summary="Создать подписки пачкой (dev)",
+    response_model_exclude_none=True,
+)
+async def create_subscriptions_bulk_view(
+    data: Annotated[
+        list[SubscriptionCreate], Body(min_length=1, max_length=MAX_BULK_SIZE)
+    ],
+    session: SessionDep,
+    on_conflict: Annotated[
+        OnConflict, Query(description="Поведение при конфликте по name")
+    ] = OnConflict.error,
+) -> list[SubscriptionReturn]:
+    """
+    ⚙️ **Dev-only endpoint**
+
+    Создаёт подписки одним INSERT.
+    Используется для заливки тарифов (`on_conflict=update` — обновить существующие по имени).
+    """
+    subscriptions = await CRUD.create_many(
+        data=data, model=Subscription, session=session, on_conflict=on_conflict
+    )
+    await plan_catalog.refresh_after_change()
+    return subscriptions
+
+
+@router.get(
+    "/count",
+    response_model=CountReturn,
+    summary="Количество тарифов (dev)",
+)
+async def count_subscriptions_view(
+    session: ReadSessionDep,
+    params: Annotated[CountParams, Query()],
+) -> CountReturn:
+    """
+    ⚙️ **Dev-only endpoint**
+
+    Возвращает количество тарифов.
+    `approximate=true` без фильтров — быстрая оценка по статистике PostgreSQL.
+    """
+    return await CRUD.count(
+        model=Subscription, session=session, approximate=params.approximate
+    )
+
+
 @router.get(
     "/",
-    response_model=list[SubscriptionReturn],
+    response_model=Page[SubscriptionReturn],
     summary="Получить список всех подписок (dev)",
+    responses=NDJSON_RESPONSE,
     response_model_exclude_none=True,
 )
-async def get_subscriptions_list_view(session: SessionDep) -> list[SubscriptionReturn]:
+async def get_subscriptions_list_view(
+    request: Request,
+    session: ReadSessionDep,
+    page: Annotated[PageParams, Query()],
+) -> Page[SubscriptionReturn] | StreamingResponse:
     """
     ⚙️ **Dev-only endpoint**
 
     Возвращает список всех подписок из базы.
     Применяется для проверки содержимого и отладки тарифов.
+    Постраничный вывод: keyset-пагинация по id, курсор следующей страницы — в next_cursor.
+    С заголовком `Accept: application/x-ndjson` — все записи потоком (NDJSON), без пагинации.
+    """
+    if accepts_ndjson(request):
+        return ndjson_response(
+            model=Subscription, schema=SubscriptionReturn, options=loader_options(Subscription)
+        )
+    return await CRUD.get(
+        model=Subscription,
+        session=session,
+        page=page,
+        options=loader_options(Subscription),
+    )
+
+
+@router.get(
+    "/subscribers/count",
+    response_model=CountReturn,
+    summary="Количество оформленных подписок (dev)",
+)
+async def count_subscribers_view(
+    session: ReadSessionDep,
+    params: Annotated[SubscribeUserCountParams, Query()],
+) -> CountReturn:
     """
-    return await CRUD.get(model=Subscription, session=session)
+    ⚙️ **Dev-only endpoint**
+
+    Возвращает количество оформленных подписок (с теми же фильтрами, что и список).
+    Например, `active=true` — число активных подписок.
+    `approximate=true` без фильтров — быстрая оценка по статистике PostgreSQL.
+    """
+    return await CRUD.count(
+        model=UserSubscription, session=session, filters=params, approximate=params.approximate
+    )
+
+
+@router.get(
+    "/subscribers",
+    response_model=Page[SubscribeUserReturn],
+    summary="Получить список оформленных подписок (dev)",
+    responses=NDJSON_RESPONSE,
+    response_model_exclude_none=True,
+)
+async def get_subscribers_list_view(
+    request: Request,
+    session: ReadSessionDep,
+    params: Annotated[SubscribeUserListParams, Query()],
+) -> Page[SubscribeUserReturn] | StreamingResponse:
+    """
+    ⚙️ **Dev-only endpoint**
+
+    Возвращает оформленные подписки пользователей (UserSubscription).
+    Постраничный вывод: keyset-пагинация, курсор следующей страницы — в next_cursor.
+    Фильтры: user_id, subscription_id, active; сортировка — sort.
+    Фильтровать можно только по индексированным полям (остальные — лишь в паре с ними).
+    С заголовком `Accept: application/x-ndjson` — все записи потоком (NDJSON), без пагинации.
+    """
+    options = loader_options(UserSubscription)
+    if accepts_ndjson(request):
+        return ndjson_response(
+            model=UserSubscription,
+            schema=SubscribeUserReturn,
+            options=options,
+            filters=params,
+        )
+    return await CRUD.get(
+        model=UserSubscription, session=session, page=params, filters=params, options=options
+    )
 
 
 @router.get(
     "/{id:int}",
     response_model=SubscriptionReturn,
     summary="Получить подписку по ID (dev)",
+    responses=NOT_MODIFIED_RESPONSE,
     response_model_exclude_none=True,
 )
 async def get_subscription_by_id_view(
     id: Annotated[int, Path(description="Идентификатор подписки")],
-    session: SessionDep,
-) -> SubscriptionReturn:
+    session: ReadSessionDep,
+    request: Request,
+    response: Response,
+) -> SubscriptionReturn | Response:
     """
     ⚙️ **Dev-only endpoint**
 
     Возвращает одну подписку по её ID.
+    Поддерживает условный GET: ETag в ответе, If-None-Match → 304.
     """
-    return await CRUD.get(model=Subscription, session=session, id=id)
+    return await get_with_etag(
+        request=request,
+        response=response,
+        model=Subscription,
+        session=session,
+        id=id,
+        options=loader_options(Subscription),
+    )
 
 
 @router.patch(
@@ -95,9 +237,15 @@ async def patch_subscription_view(
 
     Частично обновляет данные подписки — например, описание, цену или срок действия.
     """
-    return await CRUD.patch(
-        new_data=new_data, model=Subscription, session=session, id=id
+    subscription = await CRUD.patch(
+        new_data=new_data,
+        model=Subscription,
+        session=session,
+        id=id,
+        options=loader_options(Subscription),
     )
+    await plan_catalog.refresh_after_change()
+    return subscription
 
 
 @router.delete(
@@ -116,7 +264,9 @@ async def delete_subscription_view(
     Удаляет подписку по её ID.
     Удобно при тестировании миграций и CRUD-операций.
     """
-    return await CRUD.delete(id=id, session=session, model=Subscription)
+    result = await CRUD.delete(id=id, session=session, model=Subscription, db_cascade=True)
+    await plan_catalog.refresh_after_change()
+    return result
 
 
 @router.post("/subscribe")
@@ -132,10 +282,19 @@ async def subscribe_user_view(
         """
     return await subscribe(data=data, session=session)
 
-@router.get("/check/{chat_id: int}/{subscription_id: int}")
+@router.get(
+    "/check/{chat_id:int}/{subscription_id:int}",
+    response_model=bool,
+    summary="Проверить подписку пользователя (dev)",
+)
 async def check_subscriber_view(
         chat_id: int,
         subscription_id: int,
-        session: SessionDep
+        session: ReadSessionDep
 ) -> bool:
+    """
+    ⚙️ **Dev-only endpoint**
+
+    Есть ли у пользователя (по chat_id) действующая подписка на тариф — одним запросом.
+    """
     return await check_user_subscribe(chat_id=chat_id, subscription_id=subscription_id, session=session)
\ No newline at end of file
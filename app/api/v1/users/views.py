@@ -1,13 +1,19 @@
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, Path, status
+from fastapi import APIRouter, Body, Depends, Path, Query, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from services import CRUD
-from services.user.crud import create_new_user
+from services import CRUD, loader_options
+from services.user.crud import create_new_user, create_many_users
 from core.models import User, UserService
-from contracts.user import UserReturn, UserCreateForm, UserUpdate
+from contracts.user import UserReturn, UserShortReturn, UserCreateForm, UserUpdate, UserListParams, UserCountParams
 from core.database import database
+from contracts.pagination import Page, CountReturn
+from contracts.bulk import OnConflict, MAX_BULK_SIZE
+from services.streaming import NDJSON_RESPONSE, accepts_ndjson, ndjson_response
+from services.etag import NOT_MODIFIED_RESPONSE, get_with_etag
+from services.serialization import json_response
+from core.cache import invalidate_user_id
 
 router = APIRouter(
     prefix="/users",
@@ -16,6 +22,11 @@ router = APIRouter(
 )
 
 SessionDep = Annotated[AsyncSession, Depends(database.get_session)]
+# чтение — из реплики (если настроена), см. DataBaseHelper.read_session
+ReadSessionDep = Annotated[AsyncSession, Depends(database.get_read_session)]
+
+# вложенные коллекции ответа — их изменения меняют ETag
+USER_ETAG_RELATIONSHIPS = ("subscriptions", "payments", "services")
 
 
 @router.post(
@@ -28,7 +39,7 @@ SessionDep = Annotated[AsyncSession, Depends(database.get_session)]
 async def create_user_view(
     data: UserCreateForm,
     session: SessionDep,
-) -> UserReturn:
+) -> Response:
     """
     ⚙️ **Dev-only endpoint**
 
@@ -36,42 +47,120 @@ async def create_user_view(
     Используется при разработке или для ручных тестов.
     """
     user = await create_new_user(form=data, session=session)
-    return user
+    return json_response(UserReturn, user, status_code=status.HTTP_201_CREATED)
+
+
+@router.post(
+    "/bulk",
+    response_model=list[UserShortReturn],
+    status_code=status.HTTP_201_CREATED,
+    summary="Создать пользователей пачкой (dev)",
+    response_model_exclude_none=True,
+)
+async def create_users_bulk_view(
+    data: Annotated[
+        list[UserCreateForm], Body(min_length=1, max_length=MAX_BULK_SIZE)
+    ],
+    session: SessionDep,
+    on_conflict: Annotated[
+        OnConflict, Query(description="Поведение при конфликте по chat_id")
+    ] = OnConflict.error,
+) -> Response:
+    """
+    ⚙️ **Dev-only endpoint**
+
+    Создаёт пользователей и их связи с сервисами одним INSERT на таблицу.
+    Используется для импорта пользователей.
+    """
+    users = await create_many_users(forms=data, session=session, on_conflict=on_conflict)
+    return json_response(list[UserShortReturn], users, status_code=status.HTTP_201_CREATED)
+
+
+@router.get(
+    "/count",
+    response_model=CountReturn,
+    summary="Количество пользователей (dev)",
+)
+async def count_users_view(
+    session: ReadSessionDep,
+    params: Annotated[UserCountParams, Query()],
+) -> CountReturn:
+    """
+    ⚙️ **Dev-only endpoint**
+
+    Возвращает количество пользователей (с теми же фильтрами, что и список).
+    `approximate=true` без фильтров — быстрая оценка по статистике PostgreSQL.
+    """
+    return await CRUD.count(
+        model=User, session=session, filters=params, approximate=params.approximate
+    )
 
 
 @router.get(
     "/",
-    response_model=list[UserReturn],
+    response_model=Page[UserShortReturn],
     summary="Получить список всех пользователей (dev)",
+    responses=NDJSON_RESPONSE,
     response_model_exclude_none=True,
 )
-async def get_users_list_view(session: SessionDep) -> list[UserReturn]:
+async def get_users_list_view(
+    request: Request,
+    session: ReadSessionDep,
+    params: Annotated[UserListParams, Query()],
+) -> Response:
     """
     ⚙️ **Dev-only endpoint**
 
     Возвращает список всех пользователей в базе.
     Только для отладки и внутренних тестов.
+    Постраничный вывод: keyset-пагинация, курсор следующей страницы — в next_cursor.
+    Фильтры: chat_id, service_id, language; сортировка — sort.
+    Фильтровать можно только по индексированным полям (остальные — лишь в паре с ними).
+    Без вложенных коллекций: подписки, платежи и сервисы — в GET /users/{id}.
+    С заголовком `Accept: application/x-ndjson` — все записи потоком (NDJSON), без пагинации.
     """
-    return await CRUD.get(model=User, session=session)
+    if accepts_ndjson(request):
+        return ndjson_response(
+            model=User,
+            schema=UserShortReturn,
+            options=loader_options(User),
+            filters=params,
+        )
+    page = await CRUD.get(
+        model=User, session=session, page=params, filters=params, options=loader_options(User)
+    )
+    return json_response(Page[UserShortReturn], page)
 
 
 @router.get(
     "/{id:int}",
     response_model=UserReturn,
     summary="Получить пользователя по ID (dev)",
+    responses=NOT_MODIFIED_RESPONSE,
     response_model_exclude_none=True,
 )
 async def get_user_by_id_view(
     id: Annotated[int, Path(description="Идентификатор пользователя")],
-    session: SessionDep,
-) -> UserReturn:
+    session: ReadSessionDep,
+    request: Request,
+    response: Response,
+) -> Response:
     """
     ⚙️ **Dev-only endpoint**
 
     Возвращает пользователя по его ID.
     Используется для отладки и проверки CRUD-операций.
+    Поддерживает условный GET: ETag в ответе, If-None-Match → 304.
     """
-    return await CRUD.get(model=User, session=session, id=id)
+    return await get_with_etag(
+        request=request,
+        response=response,
+        model=User,
+        session=session,
+        id=id,
+        relationships=USER_ETAG_RELATIONSHIPS,
+        schema=UserReturn,
+    )
 
 
 @router.patch(
@@ -84,14 +173,15 @@ async def patch_user_view(
     id: Annotated[int, Path(description="Идентификатор пользователя")],
     new_data: UserUpdate,
     session: SessionDep,
-) -> UserReturn:
+) -> Response:
     """
     ⚙️ **Dev-only endpoint**
 
     Частично обновляет данные пользователя.
     Применяется для тестирования PATCH-операций.
     """
-    return await CRUD.patch(new_data=new_data, model=User, session=session, id=id)
+    user = await CRUD.patch(new_data=new_data, model=User, session=session, id=id)
+    return json_response(UserReturn, user)
 
 
 @router.delete(
@@ -110,4 +200,6 @@ async def delete_user_view(
     Удаляет пользователя по ID.
     Используется при тестировании CRUD и миграций.
     """
-    return await CRUD.delete(id=id, session=session, model=User)
+    result = await CRUD.delete(id=id, session=session, model=User, db_cascade=True)
+    invalidate_user_id(user_id=id)
+    return result
@@ -0,0 +1,116 @@
+"""
+Бенчмарк сериализации ответа GET /users/{id} с большими вложенными коллекциями.
+
+Сравнивает стандартный путь FastAPI (ORM-объект → response_model → jsonable_encoder
+→ json.dumps) с быстрым путём services.serialization.json_response.
+БД не нужна: пользователь собирается из несохранённых ORM-объектов.
+
+Запуск из каталога app:
+    python -m benchmarks.serialization --payments 500 --subscriptions 200 --services 50
+"""
+import argparse
+import asyncio
+import time
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from contracts.user import UserReturn
+from core.models import Payment, User, UserService, UserSubscription
+from services.serialization import json_response
+
+
+def build_user(payments: int, subscriptions: int, services: int) -> User:
+    now = datetime.now(timezone.utc)
+    return User(
+        id=1,
+        chat_id=123456789,
+        username="benchmark",
+        email="bench@example.com",
+        birthday_date=date(1990, 1, 1),
+        language="ru",
+        payments=[
+            Payment(
+                id=i,
+                user_id=1,
+                amount=Decimal("9.99"),
+                currency="USD",
+                provider="tribute",
+                provider_payload={"invoice": i, "items": [{"sku": "pro", "qty": 1}]},
+                created_at=now - timedelta(minutes=i),
+                succeeded=True,
+            )
+            for i in range(payments)
+        ],
+        subscriptions=[
+            UserSubscription(
+                id=i, user_id=1, subscription_id=i, started_at=now,
+                expires_at=now + timedelta(days=30), active=True, source="tribute",
+            )
+            for i in range(subscriptions)
+        ],
+        services=[
+            UserService(
+                id=i, user_id=1, service_id=i, is_active=True,
+                registered_at=now, last_login_at=now,
+            )
+            for i in range(services)
+        ],
+    )
+
+
+async def stock_path(field, user: User) -> bytes:
+    # то же, что делает FastAPI при `return user` и response_model=UserReturn
+    content = await serialize_response(
+        field=field, response_content=user, exclude_none=True, is_coroutine=True
+    )
+    return JSONResponse(content).body
+
+
+def fast_path(user: User) -> bytes:
+    return json_response(UserReturn, user).body
+
+
+def measure(func, rounds: int) -> float:
+    """Медиана времени одного вызова, мс."""
+    timings = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    timings.sort()
+    return timings[len(timings) // 2] * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Сериализация UserReturn: FastAPI vs json_response")
+    parser.add_argument("--payments", type=int, default=500)
+    parser.add_argument("--subscriptions", type=int, default=200)
+    parser.add_argument("--services", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+
+    user = build_user(args.payments, args.subscriptions, args.services)
+    field = create_model_field(name="Response_get_user", type_=UserReturn, mode="serialization")
+    loop = asyncio.new_event_loop()
+
+    def stock() -> bytes:
+        return loop.run_until_complete(stock_path(field, user))
+
+    assert stock() == fast_path(user), "ответы двух путей различаются"
+    stock_ms = measure(stock, args.rounds)
+    fast_ms = measure(lambda: fast_path(user), args.rounds)
+
+    print(
+        f"payments={args.payments} subscriptions={args.subscriptions} "
+        f"services={args.services} body={len(fast_path(user))} bytes"
+    )
+    print(f"fastapi response_model: {stock_ms:8.2f} ms")
+    print(f"json_response:          {fast_ms:8.2f} ms  (x{stock_ms / fast_ms:.1f})")
+
+
+if __name__ == "__main__":
+    main()
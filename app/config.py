@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
@@ -6,7 +8,72 @@ class Settings(BaseSettings):
         env_file=".env", env_file_encoding="utf-8", extra="ignore"
     )
     postgres_url: str
+    postgres_replica_url: str | None = None  # реплика только для чтения (GET-эндпоинты, проверки)
     rabbit_url: str
 
+    # параметры argon2 (пароли администраторов)
+    argon2_time_cost: int = 3
+    argon2_memory_cost: int = 64 * 1024  # KiB
+    argon2_parallelism: int = 2
+    argon2_autotune: bool = False  # подобрать параметры под argon2_target_ms при старте
+    argon2_target_ms: float = 250.0
+
+    # хеширование (argon2) вне event loop
+    hasher_executor: Literal["process", "thread"] = "process"
+    hasher_workers: int = 2
+    hasher_max_queue: int = 32  # сколько задач может одновременно ждать в пуле
+    hasher_max_waiting: int = 256  # сверх этого новые задачи отклоняются сразу (503 / nack)
+
+    # секрет («перец») для HMAC-хешей API-ключей; без него ключи хешируются argon2
+    api_key_pepper: str | None = None
+
+    # in-process кеши
+    cache_secret: str | None = None  # секрет для HMAC-отпечатков ключей в кеше
+    api_key_cache_size: int = 1024
+    api_key_cache_ttl: float = 60.0  # окно, в течение которого отзыв ключа может не дойти до других процессов
+    api_key_negative_cache_size: int = 4096
+    api_key_negative_cache_ttl: float = 30.0
+    api_key_failure_burst: int = 20  # неудачных проверок подряд на сервис до ограничения
+    api_key_failure_rate: float = 1.0  # восстановление лимита, попыток в секунду
+
+    # chat_id → User.id для AMQP-обработчиков; chat_id не меняется, поэтому TTL
+    # ограничивает только устаревание после удаления пользователя в другом процессе
+    user_id_cache_size: int = 65536
+    user_id_cache_ttl: float = 300.0
+
+    # каталог тарифов в памяти: проверка версии (изменения из других процессов), с; 0 — выключена
+    plan_catalog_check_interval: float = 30.0
+    # проверка версии при промахе (неизвестный id) — не чаще раза в N секунд
+    plan_catalog_miss_check_interval: float = 5.0
+
+    # ---------- ETag ----------
+    # Кеш ETag в памяти процесса: 304 без запроса в БД. Изменения из других процессов
+    # (AMQP-консьюмер, другие воркеры) видны только после истечения TTL; 0 — выключен.
+    etag_cache_size: int = 4096
+    etag_cache_ttl: float = 0.0
+
+    # ---------- Пулы соединений с БД ----------
+    # API и AMQP-консьюмеры используют отдельные пулы, чтобы всплеск сообщений
+    # не забирал соединения у HTTP-запросов (и наоборот).
+    # Сумма (pool_size + max_overflow) всех пулов всех процессов должна быть меньше max_connections сервера.
+    db_pool_size: int = 10
+    db_max_overflow: int = 5
+    db_amqp_pool_size: int = 5
+    db_amqp_max_overflow: int = 0
+    db_pool_timeout: float = 10.0  # ожидание свободного соединения, с; дальше — ошибка
+    db_pool_recycle: int = 1800  # пересоздавать соединения старше N секунд; -1 — никогда
+    db_pool_pre_ping: bool = True  # проверять соединение перед выдачей (обрывы, рестарт сервера)
+    db_statement_cache_size: int = 100  # кеш подготовленных выражений asyncpg на соединение; 0 — выключен
+    # PgBouncer (pool_mode=transaction) между приложением и PostgreSQL:
+    # уникальные имена подготовленных выражений, без кеша выражений asyncpg
+    db_pgbouncer: bool = False
+    db_pgbouncer_prepared_statements: bool = False  # PgBouncer >= 1.21 с max_prepared_statements > 0
+    db_null_pool: bool = False  # не держать соединения в процессе — пулом занимается PgBouncer
+
+    # ---------- Медленные запросы ----------
+    slow_query_threshold_ms: float = 200.0  # 0 — журнал выключен
+    slow_query_log_size: int = 100  # записей в кольцевом буфере
+    slow_query_explain: bool = True  # снимать план EXPLAIN (FORMAT JSON) в фоне
+
 
-settings = Settings()
\ No newline at end of file
+settings = Settings()
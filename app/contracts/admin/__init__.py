@@ -1,3 +1,3 @@
-__all__ = "AdminCreate", "AdminReturn", "AdminUpdate", "AdminCreateForm"
+__all__ = "AdminCreate", "AdminReturn", "AdminUpdate", "AdminCreateForm", "AdminLoginForm"
 
-from .schemas import AdminCreate, AdminReturn, AdminUpdate, AdminCreateForm
\ No newline at end of file
+from .schemas import AdminCreate, AdminReturn, AdminUpdate, AdminCreateForm, AdminLoginForm
\ No newline at end of file
@@ -31,6 +31,15 @@ class AdminCreateForm(AdminBase):
     password: str = Field(..., min_length=6, description="Пароль администратора")
 
 
+# ---------- Модель входа ----------
+class AdminLoginForm(BaseModel):
+    """
+    Используется при входе администратора по email и паролю.
+    """
+    email: EmailStr = Field(..., description="Электронная почта администратора")
+    password: str = Field(..., description="Пароль администратора")
+
+
 # ---------- Модель создания (в БД) ----------
 class AdminCreate(AdminBase):
     """
@@ -1 +1,3 @@
-__all__ = ""
\ No newline at end of file
+__all__ = "BaseMeta", "BaseMessage", "MessageEnvelope", "ServiceContext"
+
+from .base import BaseMeta, BaseMessage, MessageEnvelope, ServiceContext
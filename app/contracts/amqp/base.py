@@ -36,3 +36,22 @@ class BaseMessage(BaseModel):
         None,
         description="Основные данные сообщения (payload, контент события)",
     )
+
+
+class MessageEnvelope(BaseModel):
+    """
+    Минимальная структура сообщения для авторизации: только метаданные.
+    Остальные поля не валидируются — это делает обработчик очереди.
+    """
+
+    meta: BaseMeta = Field(..., description="Метаданные (время, источник, ключ и т.п.)")
+
+
+class ServiceContext(BaseModel):
+    """
+    Сервис, от имени которого пришло сообщение. Заполняется middleware
+    после проверки API-ключа и доступен обработчикам через Context("service").
+    """
+
+    service_id: int = Field(..., description="Айди сервиса из которого обращаются")
+    api_key_id: int = Field(..., description="Айди API-ключа, которым подписано сообщение")
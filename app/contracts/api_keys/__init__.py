@@ -1,3 +1,3 @@
-__all__ = "APIKeyCreate", "APIKeyReturn", "APIKeyUpdate", "APIKeyCreateForm"
+__all__ = "APIKeyCreate", "APIKeyReturn", "APIKeyUpdate", "APIKeyCreateForm", "APIKeyFilter", "APIKeyListParams", "APIKeyCountParams"
 
-from .schemas import APIKeyCreate, APIKeyReturn, APIKeyUpdate, APIKeyCreateForm
+from .schemas import APIKeyCreate, APIKeyReturn, APIKeyUpdate, APIKeyCreateForm, APIKeyFilter, APIKeyListParams, APIKeyCountParams
@@ -1,6 +1,7 @@
 from datetime import datetime
-from typing import Optional
+from typing import Optional, Literal
 from pydantic import BaseModel, Field
+from contracts.pagination import PageParams, CountParams
 
 
 # ---------- Базовая модель ----------
@@ -23,6 +24,9 @@ class APIKeyCreate(APIKeyBase):
     """
 
     key: str = Field(..., max_length=128, description="Хэш API-ключа (не сам ключ!)")
+    prefix: Optional[str] = Field(
+        None, max_length=16, description="Публичный идентификатор ключа (часть до точки)"
+    )
 
 
 # ---------- Модель создания ----------
@@ -49,6 +53,7 @@ class APIKeyReturn(APIKeyBase):
     """
 
     id: int = Field(..., description="Идентификатор API-ключа")
+    prefix: Optional[str] = Field(None, description="Публичный идентификатор ключа")
     created_at: datetime = Field(..., description="Дата создания ключа")
 
     # если нужно возвращать связанную сущность
@@ -56,3 +61,29 @@ class APIKeyReturn(APIKeyBase):
 
     class Config:
         from_attributes = True  # (Pydantic v2) — аналог orm_mode=True
+
+
+# ---------- Фильтр списка ----------
+class APIKeyFilter(BaseModel):
+    """
+    Фильтр API-ключей (см. services/filters.py).
+    """
+
+    service_id: Optional[int] = Field(None, description="Ключи сервиса")
+    is_active: Optional[bool] = Field(
+        None, description="Активность (только вместе с service_id)"
+    )
+
+
+class APIKeyListParams(APIKeyFilter, PageParams):
+    """
+    Параметры списка API-ключей: фильтр, пагинация и сортировка
+    """
+
+    sort: Literal["id", "-id"] = Field("id", description="Сортировка, '-' — по убыванию")
+
+
+class APIKeyCountParams(APIKeyFilter, CountParams):
+    """
+    Параметры подсчёта API-ключей: фильтр и режим подсчёта
+    """
@@ -0,0 +1,3 @@
+__all__ = "OnConflict", "MAX_BULK_SIZE"
+
+from .schemas import OnConflict, MAX_BULK_SIZE
@@ -0,0 +1,17 @@
+from enum import Enum
+
+MAX_BULK_SIZE = 1000  # жёсткий предел количества записей в одном bulk-запросе
+
+
+# ---------- Поведение при конфликте уникальности ----------
+class OnConflict(str, Enum):
+    """
+    Что делать со строками, которые нарушают уникальность (например, User.chat_id):
+    - error   — весь запрос отклоняется (400), как у одиночного создания;
+    - nothing — ON CONFLICT DO NOTHING: существующие записи пропускаются;
+    - update  — ON CONFLICT DO UPDATE: существующие записи перезаписываются.
+    """
+
+    error = "error"
+    nothing = "nothing"
+    update = "update"
@@ -0,0 +1,3 @@
+__all__ = "HasherMetricsReturn", "APIKeyAuthMetricsReturn", "DatabasePoolReturn", "SlowQueryReturn"
+
+from .schemas import HasherMetricsReturn, APIKeyAuthMetricsReturn, DatabasePoolReturn, SlowQueryReturn
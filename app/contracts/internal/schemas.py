@@ -0,0 +1,72 @@
+from datetime import datetime
+from typing import Any
+
+from pydantic import BaseModel, Field
+
+
+# ---------- Метрики пула хеширования ----------
+class HasherMetricsReturn(BaseModel):
+    """
+    Состояние пула, в котором выполняется argon2 (hash/verify).
+    """
+
+    executor: str = Field(..., description="Тип пула: 'process' или 'thread'")
+    workers: int = Field(..., description="Количество воркеров пула")
+    max_queue: int = Field(..., description="Максимум задач, одновременно отправленных в пул")
+    max_waiting: int = Field(..., description="Максимум ожидающих задач; сверх — отказ (503)")
+    waiting: int = Field(..., description="Задачи, ожидающие места в очереди")
+    queued: int = Field(..., description="Задачи в пуле (в очереди или выполняются)")
+    completed: int = Field(..., description="Успешно выполненные задачи")
+    failed: int = Field(..., description="Задачи, завершившиеся ошибкой")
+    rejected: int = Field(..., description="Задачи, отклонённые из-за перегрузки")
+    cancelled: int = Field(..., description="Вызывающие, отменённые до результата")
+    total_seconds: float = Field(..., description="Суммарное время выполнения, с")
+    avg_seconds: float = Field(..., description="Среднее время выполнения, с")
+    max_seconds: float = Field(..., description="Максимальное время выполнения, с")
+
+
+# ---------- Метрики проверки API-ключей ----------
+class APIKeyAuthMetricsReturn(BaseModel):
+    """
+    Счётчики кеша и лимитера проверок API-ключей.
+    """
+
+    cached_keys: int = Field(..., description="Записей в кеше успешных проверок")
+    rejected: int = Field(..., description="Ключи, проверенные и отклонённые")
+    negative_hits: int = Field(..., description="Отклонено по негативному кешу без хеширования")
+    throttled: int = Field(..., description="Отклонено из-за лимита неудачных попыток без хеширования")
+
+
+# ---------- Пулы соединений с БД ----------
+class DatabasePoolReturn(BaseModel):
+    """
+    Состояние пула соединений одного движка (API или AMQP).
+    """
+
+    name: str = Field(..., description="Назначение пула: 'api' или 'amqp'")
+    pool: str = Field(..., description="Тип пула: 'queue' или 'null' (соединения держит PgBouncer)")
+    pool_size: int = Field(..., description="Постоянных соединений в пуле")
+    max_overflow: int = Field(..., description="Дополнительных соединений сверх pool_size")
+    checked_out: int = Field(..., description="Соединения, выданные сессиям сейчас")
+    checked_in: int = Field(..., description="Свободные соединения в пуле")
+    overflow: int = Field(..., description="Открытые сверх pool_size соединения")
+    checkouts: int = Field(..., description="Выдано соединений с момента старта")
+    timeouts: int = Field(..., description="Запросы, не дождавшиеся соединения за pool_timeout")
+    total_wait_seconds: float = Field(..., description="Суммарное ожидание соединения, с")
+    avg_wait_seconds: float = Field(..., description="Среднее ожидание соединения, с")
+    max_wait_seconds: float = Field(..., description="Максимальное ожидание соединения, с")
+
+
+# ---------- Медленные запросы ----------
+class SlowQueryReturn(BaseModel):
+    """
+    Запрос, выполнявшийся дольше slow_query_threshold_ms.
+    """
+
+    statement: str = Field(..., description="SQL-запрос")
+    parameters: Any = Field(None, description="Форма параметров: типы вместо значений")
+    duration_ms: float = Field(..., description="Время выполнения, мс")
+    database: str = Field(..., description="Пул, в котором выполнялся запрос")
+    occurred_at: datetime = Field(..., description="Когда запрос завершился")
+    plan: Any = Field(None, description="План EXPLAIN (FORMAT JSON); None — ещё не снят или недоступен")
+    plan_error: str | None = Field(None, description="Почему план не снят")
@@ -0,0 +1,3 @@
+__all__ = "Page", "PageParams", "CountParams", "CountReturn", "DEFAULT_PAGE_SIZE", "MAX_PAGE_SIZE"
+
+from .schemas import Page, PageParams, CountParams, CountReturn, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
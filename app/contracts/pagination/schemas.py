@@ -0,0 +1,60 @@
+from typing import Generic, Optional, TypeVar
+
+from pydantic import BaseModel, Field
+
+T = TypeVar("T")
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200  # жёсткий предел размера страницы
+
+
+# ---------- Параметры страницы (query) ----------
+class PageParams(BaseModel):
+    """
+    Параметры keyset-пагинации списков.
+    Курсор непрозрачен для клиента — его нужно брать из next_cursor предыдущей страницы.
+    """
+
+    limit: int = Field(
+        DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Размер страницы"
+    )
+    cursor: Optional[str] = Field(
+        None, description="Курсор следующей страницы (next_cursor из прошлого ответа)"
+    )
+
+
+# ---------- Страница результата ----------
+class Page(BaseModel, Generic[T]):
+    """
+    Страница списка. next_cursor = None — это последняя страница.
+    """
+
+    items: list[T] = Field(default_factory=list, description="Записи страницы")
+    next_cursor: Optional[str] = Field(
+        None, description="Курсор следующей страницы (None — страниц больше нет)"
+    )
+
+    class Config:
+        from_attributes = True  # строится из services.pagination.PageResult
+
+
+# ---------- Параметры подсчёта (query) ----------
+class CountParams(BaseModel):
+    """
+    Параметры подсчёта записей.
+    approximate — быстрая оценка по статистике планировщика (pg_class.reltuples);
+    применяется только без фильтров, с фильтрами считается точно.
+    """
+
+    approximate: bool = Field(
+        False, description="Оценка по статистике PostgreSQL вместо точного COUNT(*)"
+    )
+
+
+# ---------- Результат подсчёта ----------
+class CountReturn(BaseModel):
+    count: int = Field(..., description="Количество записей")
+    approximate: bool = Field(..., description="True — оценка по статистике, а не точное значение")
+
+    class Config:
+        from_attributes = True
@@ -1,3 +1,3 @@
-__all__ = "PaymentCreate", "PaymentUpdate", "PaymentReturn", "PaymentCreateAMQP"
+__all__ = "PaymentCreate", "PaymentUpdate", "PaymentReturn", "PaymentCreateAMQP", "PaymentFilter", "PaymentListParams", "PaymentCountParams"
 
-from .schemas import PaymentCreate, PaymentUpdate, PaymentReturn, PaymentCreateAMQP
+from .schemas import PaymentCreate, PaymentUpdate, PaymentReturn, PaymentCreateAMQP, PaymentFilter, PaymentListParams, PaymentCountParams
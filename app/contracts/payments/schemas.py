@@ -1,6 +1,7 @@
 from datetime import datetime
-from typing import Optional, Any
+from typing import Optional, Any, Literal
 from pydantic import BaseModel, Field
+from contracts.pagination import PageParams, CountParams
 
 
 # ---------- Базовая модель ----------
@@ -54,3 +55,30 @@ class PaymentReturn(PaymentBase):
 
     class Config:
         from_attributes = True  # (Pydantic v2) — аналог orm_mode=True
+
+
+# ---------- Фильтр списка ----------
+class PaymentFilter(BaseModel):
+    """
+    Фильтр платежей (см. services/filters.py)
+    """
+    user_id: Optional[int] = Field(None, description="Платежи пользователя")
+    created_from: Optional[datetime] = Field(None, description="Созданы не раньше")
+    created_to: Optional[datetime] = Field(None, description="Созданы не позже")
+    provider: Optional[str] = Field(None, description="Провайдер (только вместе с другими фильтрами)")
+    succeeded: Optional[bool] = Field(None, description="Успешность (только вместе с другими фильтрами)")
+
+
+class PaymentListParams(PaymentFilter, PageParams):
+    """
+    Параметры списка платежей: фильтр, пагинация и сортировка
+    """
+    sort: Literal["id", "-id", "created_at", "-created_at"] = Field(
+        "id", description="Сортировка, '-' — по убыванию"
+    )
+
+
+class PaymentCountParams(PaymentFilter, CountParams):
+    """
+    Параметры подсчёта платежей: фильтр и режим подсчёта
+    """
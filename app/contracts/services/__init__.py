@@ -1,9 +1,10 @@
-__all__ = "ServiceCreate", "ServiceUpdate", "ServiceReturn"
+__all__ = "ServiceCreate", "ServiceUpdate", "ServiceReturn", "ServiceShortReturn"
 
 from .schemas import (
     ServiceCreate,
     ServiceUpdate,
     ServiceReturn,
+    ServiceShortReturn,
     UserServiceCreate,
     UserServiceReturn,
     UserServiceUpdate,
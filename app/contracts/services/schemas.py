@@ -40,16 +40,13 @@ class ServiceUpdate(BaseModel):
     owner_id: Optional[int] = None
 
 
-# ---------- Модель возврата ----------
-class ServiceReturn(ServiceBase):
+# ---------- Модель возврата (без связей) ----------
+class ServiceShortReturn(ServiceBase):
     """
-    Используется для возврата данных клиенту (HTTP-ответ или AMQP payload).
+    Используется для возврата сервиса без вложенных API-ключей (списки).
     """
 
     id: int = Field(..., description="Идентификатор сервиса")
-    api_keys: Optional[List[APIKeyReturn]] = Field(
-        default_factory=list, description="ID связанных API-ключей"
-    )
     created_at: Optional[datetime] = Field(None, description="Дата создания записи")
     updated_at: Optional[datetime] = Field(
         None, description="Дата последнего обновления"
@@ -59,6 +56,17 @@ class ServiceReturn(ServiceBase):
         from_attributes = True  # (Pydantic v2) — аналог orm_mode=True
 
 
+# ---------- Модель возврата ----------
+class ServiceReturn(ServiceShortReturn):
+    """
+    Используется для возврата данных клиенту (HTTP-ответ или AMQP payload).
+    """
+
+    api_keys: Optional[List[APIKeyReturn]] = Field(
+        default_factory=list, description="ID связанных API-ключей"
+    )
+
+
 # ---------- Базовая модель ----------
 class UserServiceBase(BaseModel):
     """
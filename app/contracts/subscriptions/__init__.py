@@ -1,4 +1,4 @@
-__all__ = "SubscriptionReturn", "SubscriptionUpdate", "SubscriptionCreate", "SubscribeUserCreate", "SubscribeUserReturn", "SubscribeUserCreateForm"
+__all__ = "SubscriptionReturn", "SubscriptionUpdate", "SubscriptionCreate", "SubscribeUserCreate", "SubscribeUserReturn", "SubscribeUserCreateForm", "SubscribeUserFilter", "SubscribeUserListParams", "SubscribeUserCountParams"
 
 
-from .schemas import SubscriptionReturn, SubscriptionUpdate, SubscriptionCreate, SubscribeUserCreate, SubscribeUserReturn, SubscribeUserCreateForm
+from .schemas import SubscriptionReturn, SubscriptionUpdate, SubscriptionCreate, SubscribeUserCreate, SubscribeUserReturn, SubscribeUserCreateForm, SubscribeUserFilter, SubscribeUserListParams, SubscribeUserCountParams
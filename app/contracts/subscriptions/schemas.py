@@ -1,7 +1,8 @@
 from datetime import datetime
-from typing import Optional
+from typing import Optional, Literal
 
 from pydantic import BaseModel, Field, condecimal, conint
+from contracts.pagination import PageParams, CountParams
 
 
 class SubscriptionBase(BaseModel):
@@ -98,4 +99,26 @@ class SubscribeUserReturn(BaseModel):
 
     model_config = {
         "from_attributes": True  # позволяет создавать схему из ORM-объекта
-    }
\ No newline at end of file
+    }
+
+
+class SubscribeUserFilter(BaseModel):
+    """
+    Фильтр оформленных подписок (см. services/filters.py)
+    """
+    user_id: Optional[int] = Field(None, description="Подписки пользователя")
+    subscription_id: Optional[int] = Field(None, description="Подписчики тарифа")
+    active: Optional[bool] = Field(None, description="Активность подписки")
+
+
+class SubscribeUserListParams(SubscribeUserFilter, PageParams):
+    """
+    Параметры списка оформленных подписок: фильтр, пагинация и сортировка
+    """
+    sort: Literal["id", "-id"] = Field("id", description="Сортировка, '-' — по убыванию")
+
+
+class SubscribeUserCountParams(SubscribeUserFilter, CountParams):
+    """
+    Параметры подсчёта оформленных подписок: фильтр и режим подсчёта
+    """
@@ -1,3 +1,3 @@
-__all__ = "UserCreate", "UserUpdate", "UserReturn", "UserCreateForm", "UserUpdateAMQP"
+__all__ = "UserCreate", "UserUpdate", "UserReturn", "UserShortReturn", "UserCreateForm", "UserUpdateAMQP", "UserFilter", "UserListParams", "UserCountParams"
 
-from .schemas import UserCreate, UserReturn, UserUpdate, UserCreateForm, UserUpdateAMQP
+from .schemas import UserCreate, UserReturn, UserShortReturn, UserUpdate, UserCreateForm, UserUpdateAMQP, UserFilter, UserListParams, UserCountParams
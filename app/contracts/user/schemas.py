@@ -1,6 +1,7 @@
 from datetime import date, datetime
-from typing import Optional, List, Any
+from typing import Optional, List, Any, Literal
 from pydantic import BaseModel, EmailStr, Field
+from contracts.pagination import PageParams, CountParams
 from contracts.subscriptions import SubscribeUserReturn
 from contracts.services import UserServiceReturn
 from contracts.payments import PaymentReturn
@@ -64,13 +65,24 @@ class UserUpdateAMQP(UserUpdate):
     chat_id: int = Field(..., description="Telegram chat_id пользователя")
 
 
+# ---------- Модель возврата (без связей) ----------
+class UserShortReturn(UserBase):
+    """
+    Используется для возврата пользователя без вложенных коллекций (списки)
+    """
+
+    id: int
+
+    class Config:
+        from_attributes = True  # (Pydantic v2) аналог orm_mode=True
+
+
 # ---------- Модель возврата ----------
-class UserReturn(UserBase):
+class UserReturn(UserShortReturn):
     """
     Используется для возврата данных пользователю (в ответах API)
     """
 
-    id: int
     subscriptions: Optional[List[SubscribeUserReturn]] = Field(
         default_factory=list, description="ID подписок пользователя"
     )
@@ -83,3 +95,30 @@ class UserReturn(UserBase):
 
     class Config:
         from_attributes = True  # (Pydantic v2) аналог orm_mode=True
+
+
+# ---------- Фильтр списка ----------
+class UserFilter(BaseModel):
+    """
+    Фильтр пользователей (см. services/filters.py)
+    """
+
+    chat_id: Optional[int] = Field(None, description="Telegram chat_id")
+    service_id: Optional[int] = Field(None, description="Пользователи сервиса")
+    language: Optional[str] = Field(
+        None, description="Язык (только вместе с chat_id или service_id)"
+    )
+
+
+class UserListParams(UserFilter, PageParams):
+    """
+    Параметры списка пользователей: фильтр, пагинация и сортировка
+    """
+
+    sort: Literal["id", "-id"] = Field("id", description="Сортировка, '-' — по убыванию")
+
+
+class UserCountParams(UserFilter, CountParams):
+    """
+    Параметры подсчёта пользователей: фильтр и режим подсчёта
+    """
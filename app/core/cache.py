@@ -0,0 +1,232 @@
+import hashlib
+import hmac
+import secrets
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+from typing import Callable, Generic, Hashable, TypeVar
+
+from config import settings
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class TTLCache(Generic[K, V]):
+    """
+    💡 In-process кеш с ограничением по размеру (LRU) и времени жизни записи (TTL).
+
+    Не потокобезопасен — рассчитан на использование из одного event loop.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[K, tuple[float, V]] = OrderedDict()
+
+    def get(self, key: K) -> V | None:
+        item = self._data.get(key)
+        if item is None:
+            return None
+        expires_at, value = item
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: K, value: V) -> None:
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: K) -> V | None:
+        item = self._data.pop(key, None)
+        return None if item is None else item[1]
+
+    def evict_where(self, predicate: Callable[[K, V], bool]) -> int:
+        """
+        Удаляет все записи, для которых predicate(key, value) истинно.
+        Возвращает количество удалённых записей.
+        """
+        stale = [key for key, (_, value) in self._data.items() if predicate(key, value)]
+        for key in stale:
+            del self._data[key]
+        return len(stale)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+# Секрет для отпечатков ключей. Если не задан в настройках — генерируется на процесс:
+# кеш живёт только в памяти процесса, поэтому стабильность между рестартами не нужна.
+_FINGERPRINT_SECRET = (
+    settings.cache_secret.encode() if settings.cache_secret else secrets.token_bytes(32)
+)
+
+
+def fingerprint(value: str) -> str:
+    """
+    HMAC-SHA256 отпечаток секрета — позволяет использовать его как ключ кеша,
+    не храня сам секрет в памяти.
+    """
+    return hmac.new(_FINGERPRINT_SECRET, value.encode(), hashlib.sha256).hexdigest()
+
+
+# ---------- Кеш успешных проверок API-ключей ----------
+# (service_id, fingerprint(api_key)) -> APIKey.id
+api_key_cache: TTLCache[tuple[int, str], int] = TTLCache(
+    maxsize=settings.api_key_cache_size, ttl=settings.api_key_cache_ttl
+)
+
+
+# ---------- Кеш идентификаторов пользователей ----------
+# chat_id -> User.id (см. services/user/crud.py::resolve_user_id)
+user_id_cache: TTLCache[int, int] = TTLCache(
+    maxsize=settings.user_id_cache_size, ttl=settings.user_id_cache_ttl
+)
+
+
+def invalidate_user_id(user_id: int) -> None:
+    """Сбрасывает chat_id -> User.id для пользователя (при его удалении)."""
+    user_id_cache.evict_where(lambda key, value: value == user_id)
+
+
+# ---------- Кеш ETag ----------
+# (имя таблицы, id) -> ETag сущности (см. services/etag.py)
+etag_cache: TTLCache[tuple[str, int], str] = TTLCache(
+    maxsize=settings.etag_cache_size, ttl=settings.etag_cache_ttl
+)
+
+
+def invalidate_etag(table: str, id: int) -> None:
+    """Сбрасывает закешированный ETag сущности (при её изменении или удалении)."""
+    etag_cache.pop((table, id))
+
+
+# ---------- Негативный кеш и лимит неудачных проверок ----------
+class TokenBucket:
+    """
+    Классический token bucket: capacity токенов, восстановление rate токенов в секунду.
+    """
+
+    def __init__(self, capacity: int, rate: float):
+        self.capacity = capacity
+        self.rate = rate
+        self.tokens = float(capacity)
+        self.updated_at = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def is_empty(self) -> bool:
+        self._refill()
+        return self.tokens < 1
+
+    def consume(self) -> bool:
+        self._refill()
+        if self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
+
+
+@dataclass
+class FailureLimiterMetrics:
+    rejected: int = 0  # ключ проверен и отклонён
+    negative_hits: int = 0  # отклонён по негативному кешу без хеширования
+    throttled: int = 0  # отклонён из-за превышения лимита без хеширования
+
+    def snapshot(self) -> dict[str, int]:
+        return asdict(self)
+
+
+class FailureLimiter:
+    """
+    💡 Защита от перебора ключей и CPU-DoS.
+
+    - Негативный кеш недавно отклонённых пар (service_id, fingerprint(key)):
+      повторный неверный ключ отклоняется без хеширования.
+    - Token bucket неудачных проверок хеша на сервис: после исчерпания лимита
+      новые (ещё не проверенные) ключи сервиса отклоняются без хеширования.
+      Бакет расходуют только промахи, на которые реально считался хеш:
+      ключ без совпадения по префиксу хеш не стоит и лимит не тратит —
+      иначе мусорными ключами можно было бы заблокировать сервису авторизацию.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, burst: int, rate: float):
+        self.burst = burst
+        self.rate = rate
+        self.metrics = FailureLimiterMetrics()
+        self._rejected: TTLCache[tuple[int, str], bool] = TTLCache(maxsize=maxsize, ttl=ttl)
+        # service_id приходит от клиента, поэтому бакеты тоже в ограниченном кеше
+        self._buckets: TTLCache[int, TokenBucket] = TTLCache(
+            maxsize=maxsize, ttl=burst / rate if rate > 0 else ttl
+        )
+
+    def _bucket(self, service_id: int) -> TokenBucket:
+        bucket = self._buckets.get(service_id)
+        if bucket is None:
+            bucket = TokenBucket(capacity=self.burst, rate=self.rate)
+        self._buckets.set(service_id, bucket)
+        return bucket
+
+    def is_known_bad(self, cache_key: tuple[int, str]) -> bool:
+        """Проверка до выборки ключей: True — ключ недавно отклонён, отклонить сразу."""
+        if self._rejected.get(cache_key) is not None:
+            self.metrics.negative_hits += 1
+            return True
+        return False
+
+    def is_throttled(self, service_id: int) -> bool:
+        """Проверка перед хешированием: True — лимит неудачных проверок сервиса исчерпан."""
+        bucket = self._buckets.get(service_id)
+        if bucket is not None and bucket.is_empty():
+            self.metrics.throttled += 1
+            return True
+        return False
+
+    def record_failure(self, cache_key: tuple[int, str], hashed: bool) -> None:
+        """
+        Запоминает отклонённый ключ. hashed=True — отклонён после проверки хеша,
+        только такие промахи расходуют бакет сервиса.
+        """
+        self.metrics.rejected += 1
+        self._rejected.set(cache_key, True)
+        if hashed:
+            self._bucket(cache_key[0]).consume()
+
+    def reset_service(self, service_id: int) -> None:
+        self._rejected.evict_where(lambda key, value: key[0] == service_id)
+        self._buckets.pop(service_id)
+
+
+api_key_failures = FailureLimiter(
+    maxsize=settings.api_key_negative_cache_size,
+    ttl=settings.api_key_negative_cache_ttl,
+    burst=settings.api_key_failure_burst,
+    rate=settings.api_key_failure_rate,
+)
+
+
+def invalidate_api_key(api_key_id: int, service_id: int | None = None) -> None:
+    """
+    Сбрасывает кеш проверок для ключа (при изменении или удалении ключа).
+    Если передан service_id — сбрасывается и негативный кеш сервиса
+    (после изменения ключ мог снова стать активным).
+    """
+    api_key_cache.evict_where(lambda key, value: value == api_key_id)
+    if service_id is not None:
+        api_key_failures.reset_service(service_id)
+
+
+def invalidate_service_api_keys(service_id: int) -> None:
+    """Сбрасывает кеш проверок для всех ключей сервиса (при удалении сервиса)."""
+    api_key_cache.evict_where(lambda key, value: key[0] == service_id)
+    api_key_failures.reset_service(service_id)
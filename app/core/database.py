@@ -1,29 +1,271 @@
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, asdict
+from typing import Any, Iterator
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import (
     create_async_engine,
     AsyncSession,
     async_scoped_session,
     async_sessionmaker,
 )
+from sqlalchemy.orm import ORMExecuteState, Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, QueuePool
 from asyncio import current_task
 from config import settings
+from core.instrumentation import instrument_engine
+
+
+@dataclass
+class PoolMetrics:
+    """
+    Метрики ожидания соединений пула.
+    wait — время от запроса соединения до его выдачи (включая открытие нового).
+    """
+    checkouts: int = 0
+    in_use: int = 0
+    timeouts: int = 0
+    total_wait_seconds: float = 0.0
+    max_wait_seconds: float = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.checkouts += 1
+        self.in_use += 1
+        self.total_wait_seconds += seconds
+        self.max_wait_seconds = max(self.max_wait_seconds, seconds)
+
+    def snapshot(self) -> dict[str, Any]:
+        data = asdict(self)
+        data["avg_wait_seconds"] = (
+            self.total_wait_seconds / self.checkouts if self.checkouts else 0.0
+        )
+        return data
+
+
+class InstrumentedPoolMixin:
+    """
+    Замеряет время ожидания соединения пула.
+    При пустом пуле и исчерпанном max_overflow запрос ждёт до pool_timeout —
+    это время и есть стоимость нехватки соединений. Для NullPool это время
+    открытия нового соединения (до PgBouncer).
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            self.metrics.timeouts += 1
+            raise
+        self.metrics.observe(time.perf_counter() - started)
+        return connection
+
+    def _do_return_conn(self, record) -> None:
+        self.metrics.in_use -= 1
+        super()._do_return_conn(record)
+
+
+class InstrumentedQueuePool(InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+class InstrumentedNullPool(InstrumentedPoolMixin, NullPool):
+    pass
+
+
+def asyncpg_connect_args(pgbouncer: bool) -> dict[str, Any]:
+    """
+    Параметры подключения asyncpg.
+
+    💡 PgBouncer в режиме transaction: между транзакциями клиент попадает на разные
+    серверные соединения. Поэтому:
+    - кеш выражений самого asyncpg выключен (statement_cache_size=0);
+    - имена подготовленных выражений уникальны (uuid), чтобы не пересекаться
+      с выражениями других клиентов на том же серверном соединении;
+    - кеш prepare в SQLAlchemy включается только если PgBouncer умеет
+      подготовленные выражения (>= 1.21, max_prepared_statements > 0).
+    """
+    cache_size = settings.db_statement_cache_size
+    if not pgbouncer:
+        # кеш SQLAlchemy (prepare) и собственный кеш asyncpg
+        return {
+            "prepared_statement_cache_size": cache_size,
+            "statement_cache_size": cache_size,
+        }
+    return {
+        "prepared_statement_cache_size": (
+            cache_size if settings.db_pgbouncer_prepared_statements else 0
+        ),
+        "statement_cache_size": 0,
+        "prepared_statement_name_func": lambda: f"__asyncpg_{uuid.uuid4()}__",
+    }
+
+
+# ---------- Read-your-writes ----------
+# True — в текущем запросе/сообщении уже был коммит с записью в primary:
+# дальнейшие чтения идут в primary, иначе реплика (с лагом) может не видеть записанное.
+# Контекст asyncio-задачи: у каждого HTTP-запроса он свой.
+_primary_pinned: ContextVar[bool] = ContextVar("primary_pinned", default=False)
+
+
+@contextmanager
+def read_your_writes_scope() -> Iterator[None]:
+    """
+    Границы «одного запроса/сообщения» для read-your-writes.
+    Нужен там, где несколько единиц работы выполняются в одной задаче (AMQP-консьюмер).
+    """
+    token = _primary_pinned.set(False)
+    try:
+        yield
+    finally:
+        _primary_pinned.reset(token)
+
+
+class PrimarySession(Session):
+    """Сессия primary: после коммита с записью закрепляет чтения текущего контекста за primary."""
+
+
+@event.listens_for(PrimarySession, "do_orm_execute")
+def _track_dml(state: ORMExecuteState) -> None:
+    if state.is_insert or state.is_update or state.is_delete:
+        state.session.info["has_writes"] = True
+
+
+@event.listens_for(PrimarySession, "after_flush")
+def _track_flush(session: Session, flush_context: Any) -> None:
+    session.info["has_writes"] = True
+
+
+@event.listens_for(PrimarySession, "after_commit")
+def _pin_primary(session: Session) -> None:
+    if session.info.pop("has_writes", False):
+        _primary_pinned.set(True)
+
+
+@event.listens_for(PrimarySession, "after_rollback")
+def _reset_writes(session: Session) -> None:
+    session.info.pop("has_writes", None)
 
 
 class DataBaseHelper:
-    def __init__(self, url: str):
-        self.engine = create_async_engine(url=url)
+    def __init__(
+        self,
+        url: str,
+        name: str = "api",
+        pool_size: int = settings.db_pool_size,
+        max_overflow: int = settings.db_max_overflow,
+        replica_url: str | None = None,
+        pgbouncer: bool = settings.db_pgbouncer,
+        null_pool: bool = settings.db_null_pool,
+    ):
+        self.name = name
+        connect_args = {}
+        if make_url(url).get_driver_name() == "asyncpg":
+            connect_args = asyncpg_connect_args(pgbouncer)
+        if null_pool:
+            # соединения держит PgBouncer: процесс открывает их на каждую сессию
+            pool_args = {"poolclass": InstrumentedNullPool}
+        else:
+            pool_args = {
+                "poolclass": InstrumentedQueuePool,
+                "pool_size": pool_size,
+                "max_overflow": max_overflow,
+                "pool_timeout": settings.db_pool_timeout,
+            }
+        self.engine = create_async_engine(
+            url=url,
+            **pool_args,
+            pool_recycle=settings.db_pool_recycle,
+            pool_pre_ping=settings.db_pool_pre_ping,
+            connect_args=connect_args,
+        )
+        instrument_engine(self.engine, name=name)
         self.session_maker = async_sessionmaker(
             bind=self.engine,
+            sync_session_class=PrimarySession,
             autoflush=False,  # не сбрасываем все несохранённые данные перед запросом
             # Изменения копяться в памяти до .commit() или .flush()
             autocommit=False,  # Не коммитим запрос сразу. В одной сессии копяться команды и мы
             # выполняем их одной транзакцией
             expire_on_commit=False,  # Актуальность обьекта (User например) остаёться после изменения даты рождения.
         )
+        # реплика только для чтения; без неё чтения идут в primary
+        self.replica: DataBaseHelper | None = None
+        if replica_url:
+            self.replica = DataBaseHelper(
+                url=replica_url,
+                name=f"{name}-replica",
+                pool_size=pool_size,
+                max_overflow=max_overflow,
+                pgbouncer=pgbouncer,
+                null_pool=null_pool,
+            )
 
     async def get_session(self) -> AsyncSession:
         async with self.session_maker() as sess:
             yield sess
             await sess.close()
 
+    def read_session(self) -> AsyncSession:
+        """
+        💡 Сессия только для чтения: реплика, если она настроена.
+        После записи в текущем запросе/сообщении — primary (read-your-writes).
+        """
+        if self.replica is None or _primary_pinned.get():
+            return self.session_maker()
+        return self.replica.session_maker()
+
+    async def get_read_session(self) -> AsyncSession:
+        async with self.read_session() as sess:
+            yield sess
+
+    def pool_status(self) -> dict[str, Any]:
+        """Текущее состояние пула и накопленные метрики ожидания."""
+        pool: InstrumentedPoolMixin = self.engine.pool
+        if isinstance(pool, QueuePool):
+            sizes = {
+                "pool": "queue",
+                "pool_size": pool.size(),
+                "max_overflow": pool._max_overflow,
+                "checked_in": pool.checkedin(),
+                "overflow": max(pool.overflow(), 0),
+            }
+        else:
+            sizes = {"pool": "null", "pool_size": 0, "max_overflow": 0, "checked_in": 0, "overflow": 0}
+        metrics = pool.metrics.snapshot()
+        return {"name": self.name, "checked_out": metrics.pop("in_use"), **sizes, **metrics}
+
+    async def dispose(self) -> None:
+        await self.engine.dispose()
+        if self.replica is not None:
+            await self.replica.dispose()
+
 
-database = DataBaseHelper(url=settings.postgres_url)
\ No newline at end of file
+# HTTP API
+database = DataBaseHelper(url=settings.postgres_url, replica_url=settings.postgres_replica_url)
+# AMQP-консьюмеры (ServiceAuthMiddleware и обработчики сообщений)
+amqp_database = DataBaseHelper(
+    url=settings.postgres_url,
+    name="amqp",
+    pool_size=settings.db_amqp_pool_size,
+    max_overflow=settings.db_amqp_max_overflow,
+    replica_url=settings.postgres_replica_url,
+)
+databases = (database, amqp_database)
+# все пулы, включая реплики, — для метрик
+database_pools = tuple(
+    db for helper in databases for db in (helper, helper.replica) if db is not None
+)
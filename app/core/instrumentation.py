@@ -0,0 +1,239 @@
+import asyncio
+import contextvars
+import logging
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, asdict
+from datetime import datetime, timezone
+from typing import Any, Iterator
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from config import settings
+
+logger = logging.getLogger("sql")
+
+SLOWEST_STATEMENT_LENGTH = 300  # символов SQL в логе
+EXPLAINABLE = ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH")
+
+
+@dataclass
+class QueryStats:
+    """
+    SQL-статистика одной единицы работы (HTTP-запрос или AMQP-сообщение).
+    """
+    count: int = 0
+    failed: int = 0
+    total_seconds: float = 0.0
+    slowest_seconds: float = 0.0
+    slowest_statement: str | None = None
+
+    def observe(self, statement: str, seconds: float, failed: bool = False) -> None:
+        self.count += 1
+        self.failed += failed
+        self.total_seconds += seconds
+        if seconds >= self.slowest_seconds:
+            self.slowest_seconds = seconds
+            self.slowest_statement = statement
+
+    def server_timing(self) -> str:
+        """Значение заголовка Server-Timing (длительности — в мс)."""
+        return (
+            f'db;dur={self.total_seconds * 1000:.2f};desc="{self.count} queries", '
+            f"db-slowest;dur={self.slowest_seconds * 1000:.2f}"
+        )
+
+    def log_fields(self) -> dict[str, Any]:
+        """Поля структурированного лога (logging extra)."""
+        statement = self.slowest_statement
+        if statement is not None:
+            statement = " ".join(statement.split())[:SLOWEST_STATEMENT_LENGTH]
+        return {
+            "db_queries": self.count,
+            "db_failed_queries": self.failed,
+            "db_time_ms": round(self.total_seconds * 1000, 2),
+            "db_slowest_ms": round(self.slowest_seconds * 1000, 2),
+            "db_slowest_statement": statement,
+        }
+
+
+# статистика текущего HTTP-запроса / AMQP-сообщения; None — вне единицы работы
+_query_stats: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+@contextmanager
+def collect_queries() -> Iterator[QueryStats]:
+    """Собирает статистику всех SQL-запросов, выполненных внутри блока."""
+    stats = QueryStats()
+    token = _query_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _query_stats.reset(token)
+
+
+def log_query_stats(stats: QueryStats, unit: str) -> None:
+    """Пишет статистику единицы работы в лог 'sql'."""
+    fields = stats.log_fields()
+    logger.info(
+        f"{unit}: {fields['db_queries']} queries, {fields['db_time_ms']} ms "
+        f"(slowest {fields['db_slowest_ms']} ms)",
+        extra=fields,
+    )
+
+
+# ---------- Журнал медленных запросов ----------
+def parameters_shape(parameters: Any, executemany: bool = False) -> Any:
+    """
+    Форма параметров запроса — типы вместо значений (значения могут быть персональными данными).
+    Для executemany — форма первой строки и количество строк.
+    """
+    if executemany:
+        rows = list(parameters)
+        return {"rows": len(rows), "row": parameters_shape(rows[0]) if rows else None}
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [type(value).__name__ for value in parameters]
+    return type(parameters).__name__
+
+
+@dataclass
+class SlowQuery:
+    statement: str
+    parameters: Any  # форма параметров, см. parameters_shape
+    duration_ms: float
+    database: str
+    occurred_at: datetime
+    plan: Any = None  # EXPLAIN (FORMAT JSON)
+    plan_error: str | None = None
+
+
+class SlowQueryLog:
+    """
+    💡 Кольцевой буфер медленных запросов (дольше threshold_ms).
+
+    План (EXPLAIN без ANALYZE — запрос не выполняется повторно) снимается
+    в фоновой задаче отдельным соединением, не задерживая исходный запрос.
+    Одновременно снимается не больше одного плана: при потоке медленных
+    запросов остальные записи сохраняются без плана, чтобы не нагружать
+    и без того медленную БД.
+    """
+
+    def __init__(self, maxsize: int, threshold_ms: float, explain: bool):
+        self.threshold_ms = threshold_ms
+        self.explain = explain
+        self._entries: deque[SlowQuery] = deque(maxlen=maxsize)
+        self._explaining = False
+        self._tasks: set[asyncio.Task] = set()
+
+    def record(
+        self,
+        engine: AsyncEngine,
+        name: str,
+        statement: str,
+        parameters: Any,
+        executemany: bool,
+        seconds: float,
+    ) -> None:
+        entry = SlowQuery(
+            statement=statement,
+            parameters=parameters_shape(parameters, executemany),
+            duration_ms=round(seconds * 1000, 2),
+            database=name,
+            occurred_at=datetime.now(timezone.utc),
+        )
+        self._entries.append(entry)
+        logger.warning(f"Slow query ({entry.duration_ms} ms, {name}): {' '.join(statement.split())[:SLOWEST_STATEMENT_LENGTH]}")
+
+        if not self.explain or executemany or engine.dialect.name != "postgresql":
+            return
+        if not statement.lstrip().upper().startswith(EXPLAINABLE):
+            return
+        if self._explaining:
+            entry.plan_error = "skipped: another plan is being captured"
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:  # синхронный движок (например, миграции)
+            return
+        self._explaining = True
+        # пустой контекст — запросы EXPLAIN не попадают в статистику исходного запроса
+        task = loop.create_task(
+            self._capture_plan(engine, entry, parameters), context=contextvars.Context()
+        )
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _capture_plan(self, engine: AsyncEngine, entry: SlowQuery, parameters: Any) -> None:
+        try:
+            async with engine.connect() as conn:
+                result = await conn.exec_driver_sql(
+                    f"EXPLAIN (ANALYZE off, FORMAT JSON) {entry.statement}", parameters
+                )
+                entry.plan = result.scalar()
+        except Exception as err:
+            entry.plan_error = f"{type(err).__name__}: {err}"
+        finally:
+            self._explaining = False
+
+    def snapshot(self) -> list[dict[str, Any]]:
+        """Записи буфера, новые первыми."""
+        return [asdict(entry) for entry in reversed(self._entries)]
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+slow_queries = SlowQueryLog(
+    maxsize=settings.slow_query_log_size,
+    threshold_ms=settings.slow_query_threshold_ms,
+    explain=settings.slow_query_explain,
+)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    # время старта — на ExecutionContext: он живёт ровно один запрос,
+    # в том числе упавший (after_cursor_execute для него не вызывается)
+    if context is not None:
+        context._query_started_at = time.perf_counter()
+
+
+def _elapsed(context) -> float | None:
+    started_at = getattr(context, "_query_started_at", None)
+    return None if started_at is None else time.perf_counter() - started_at
+
+
+def instrument_engine(engine: AsyncEngine, name: str) -> None:
+    """
+    💡 Подключает к движку замер запросов и журнал медленных запросов.
+    Время — от отправки запроса драйверу до получения результата.
+    """
+
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+        seconds = _elapsed(context)
+        if seconds is None:
+            return
+        stats = _query_stats.get()
+        if stats is not None:
+            stats.observe(statement, seconds)
+        if (
+            slow_queries.threshold_ms > 0
+            and seconds * 1000 >= slow_queries.threshold_ms
+            and not statement.startswith("EXPLAIN")
+        ):
+            slow_queries.record(engine, name, statement, parameters, executemany, seconds)
+
+    def handle_error(exception_context) -> None:
+        # упавший запрос тоже учитывается в статистике единицы работы
+        seconds = _elapsed(exception_context.execution_context)
+        stats = _query_stats.get()
+        if seconds is not None and stats is not None and exception_context.statement:
+            stats.observe(exception_context.statement, seconds, failed=True)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", after_cursor_execute)
+    event.listen(engine.sync_engine, "handle_error", handle_error)
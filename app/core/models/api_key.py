@@ -12,13 +12,20 @@ class APIKey(Base):
     """
     Таблица API-ключей для сервисов.
     Храним ХЕШ ключа (а не сам ключ) в поле key.
+    Публичный префикс ключа (prefix) хранится открыто и индексирован —
+    по нему ключ находится одной выборкой без перебора хешей.
     """
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     service_id: Mapped[int] = mapped_column(
         Integer,
         ForeignKey("Service.id", ondelete="CASCADE"),
+        index=True,
         nullable=False
     )
+    # NULL только у ключей, выпущенных до появления префиксов (legacy)
+    prefix: Mapped[str | None] = mapped_column(
+        String(16), unique=True, index=True, nullable=True
+    )
     key: Mapped[str] = mapped_column(String(128), unique=True, nullable=False)
     description: Mapped[str | None] = mapped_column(String(256), nullable=True)
     is_active: Mapped[bool] = mapped_column(Boolean, nullable=False, default=True)
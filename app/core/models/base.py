@@ -1,9 +1,20 @@
+from sqlalchemy import Integer, literal_column
 from sqlalchemy.orm import DeclarativeBase, declared_attr, mapped_column, Mapped
 
 class Base(DeclarativeBase):
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    # Версия строки: +1 при каждом UPDATE (и через ORM, и через update()) — основа ETag.
+    # Значение считает БД, поэтому eager_defaults — новая версия приходит в RETURNING.
+    version: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=1,
+        server_default="1",
+        onupdate=literal_column("version") + 1,
+    )
     __abstract__ = True
+    __mapper_args__ = {"eager_defaults": True}
 
     @declared_attr.directive
     def __tablename__(cls):
-        return f"{cls.__name__}"
\ No newline at end of file
+        return f"{cls.__name__}"
@@ -2,7 +2,7 @@ from __future__ import annotations
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import Integer, BigInteger, String, Numeric, DateTime, Boolean, ForeignKey, JSON, func
+from sqlalchemy import Integer, BigInteger, String, Numeric, DateTime, Boolean, ForeignKey, JSON, Index, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .base import Base
@@ -22,11 +22,16 @@ class Payment(Base):
     provider: Mapped[str] = mapped_column(String(64), nullable=False)
     provider_payload: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), server_default=func.now(), nullable=False
+        DateTime(timezone=True), server_default=func.now(), nullable=False, index=True
     )
     succeeded: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
     # Связь с User для удобства ORM
     user: Mapped[Optional["User"]] = relationship(back_populates="payments")
 
+    __table_args__ = (
+        # платежи пользователя за период: WHERE user_id = ? AND created_at BETWEEN ...
+        Index("ix_Payment_user_id_created_at", "user_id", "created_at"),
+    )
+
     def __repr__(self) -> str:
         return f"<Payment id={self.id} provider={self.provider} succeeded={self.succeeded}>"
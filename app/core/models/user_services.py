@@ -31,7 +31,7 @@ class UserService(Base):
         nullable=False,
     )
     service_id = mapped_column(
-        Integer, ForeignKey("Service.id", ondelete="CASCADE"), nullable=False
+        Integer, ForeignKey("Service.id", ondelete="CASCADE"), index=True, nullable=False
     )
     registered_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), nullable=False, default=func.now()
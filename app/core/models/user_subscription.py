@@ -3,7 +3,7 @@ from __future__ import annotations
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import Integer, BigInteger, DateTime, String, Boolean, ForeignKey, func, CheckConstraint
+from sqlalchemy import Integer, BigInteger, DateTime, String, Boolean, ForeignKey, Index, func, text, CheckConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .base import Base
@@ -19,7 +19,7 @@ class UserSubscription(Base):
         BigInteger, ForeignKey("User.id", ondelete="CASCADE"), index=True, nullable=False
     )
     subscription_id: Mapped[int] = mapped_column(
-        Integer, ForeignKey("Subscription.id", ondelete="SET NULL"), nullable=False
+        Integer, ForeignKey("Subscription.id", ondelete="SET NULL"), index=True, nullable=False
     )
     started_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), nullable=False
@@ -35,6 +35,17 @@ class UserSubscription(Base):
     __table_args__ = (
         # Простая санитарная проверка: дата окончания, если задана, не может быть раньше старта
         CheckConstraint("(expires_at IS NULL) OR (expires_at >= started_at)", name="chk_subscription_time_valid"),
+        # активные подписки (всего и по тарифу): WHERE active = ? [AND subscription_id = ?]
+        Index("ix_UserSubscription_active_subscription_id", "active", "subscription_id"),
+        # проверка доступа (check_user_subscribe): только активные подписки,
+        # expires_at в индексе — EXISTS отвечает index-only scan без чтения таблицы
+        Index(
+            "ix_UserSubscription_entitlement",
+            "user_id",
+            "subscription_id",
+            "expires_at",
+            postgresql_where=text("active"),
+        ),
     )
 
     def __repr__(self) -> str:
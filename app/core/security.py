@@ -1,14 +1,56 @@
+import asyncio
+import hashlib
+import hmac
+import multiprocessing
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, asdict
+from typing import Any, Callable
+
 from argon2 import PasswordHasher, Type
 from argon2.exceptions import VerificationError, VerifyMismatchError
+from fastapi import HTTPException, status
+
+from config import settings
+
+@dataclass(frozen=True)
+class Argon2Params:
+    """
+    Параметры argon2id, влияющие на стоимость проверки.
+    """
+    time_cost: int
+    memory_cost: int  # KiB
+    parallelism: int
+
 
-HASHER = PasswordHasher(
-    time_cost=3,
-    memory_cost=64 * 1024,
-    parallelism=2,
-    hash_len=32,
-    salt_len=16,
-    type=Type.ID
+def _make_hasher(params: Argon2Params) -> PasswordHasher:
+    return PasswordHasher(
+        time_cost=params.time_cost,
+        memory_cost=params.memory_cost,
+        parallelism=params.parallelism,
+        hash_len=32,
+        salt_len=16,
+        type=Type.ID
+    )
+
+
+HASHER_PARAMS = Argon2Params(
+    time_cost=settings.argon2_time_cost,
+    memory_cost=settings.argon2_memory_cost,
+    parallelism=settings.argon2_parallelism,
 )
+HASHER = _make_hasher(HASHER_PARAMS)
+
+
+def configure_hasher(params: Argon2Params) -> None:
+    """
+    Заменяет параметры глобального HASHER.
+    Вызывается при старте (после калибровки) и в воркерах пула процессов.
+    Хеши со старыми параметрами остаются валидными и пересчитываются при входе.
+    """
+    global HASHER, HASHER_PARAMS
+    HASHER_PARAMS = params
+    HASHER = _make_hasher(params)
 
 def hash_password(plain_password: str) -> str:
     """
@@ -30,4 +72,288 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     try:
         return HASHER.verify(hashed_password, plain_password)
     except (VerifyMismatchError, VerificationError, Exception):
-        return False
\ No newline at end of file
+        return False
+
+def verify_and_update_password(plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+    """
+    Проверяет пароль и, если хеш создан с устаревшими параметрами
+    (HASHER.check_needs_rehash), возвращает новый хеш с текущими параметрами.
+    Возвращает (пароль верен, новый хеш или None).
+    """
+    if not verify_password(plain_password, hashed_password):
+        return False, None
+    if HASHER.check_needs_rehash(hashed_password):
+        return True, HASHER.hash(plain_password)
+    return True, None
+
+
+# ---------- Калибровка argon2 ----------
+MIN_MEMORY_COST = 19 * 1024  # минимум для argon2id по рекомендациям OWASP, KiB
+
+
+def measure_verify_ms(params: Argon2Params, rounds: int = 3) -> float:
+    """Лучшее из rounds время проверки пароля с заданными параметрами, мс."""
+    hasher = _make_hasher(params)
+    hashed = hasher.hash("calibration-password")
+    best = float("inf")
+    for _ in range(rounds):
+        started = time.perf_counter()
+        hasher.verify(hashed, "calibration-password")
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def calibrate_hasher(
+    target_ms: float,
+    memory_cost: int = settings.argon2_memory_cost,
+    parallelism: int = settings.argon2_parallelism,
+    max_time_cost: int = 10,
+) -> Argon2Params:
+    """
+    Подбирает параметры argon2id под целевое время проверки на текущем железе.
+
+    Память фиксируется (memory_cost), time_cost увеличивается, пока проверка
+    укладывается в target_ms. Если не укладывается даже time_cost=1 —
+    память уменьшается вдвое, но не ниже MIN_MEMORY_COST.
+    """
+    while True:
+        best: Argon2Params | None = None
+        for time_cost in range(1, max_time_cost + 1):
+            params = Argon2Params(time_cost, memory_cost, parallelism)
+            if measure_verify_ms(params) > target_ms:
+                break
+            best = params
+        if best is not None:
+            return best
+        if memory_cost <= MIN_MEMORY_COST:
+            return Argon2Params(1, MIN_MEMORY_COST, parallelism)
+        memory_cost = max(MIN_MEMORY_COST, memory_cost // 2)
+
+
+# ---------- Хеширование вне event loop ----------
+
+@dataclass
+class HasherMetrics:
+    """
+    Метрики пула хеширования.
+    waiting — задачи, ждущие места в очереди пула (backpressure);
+    queued — задачи, отправленные в пул и ещё не завершённые;
+    rejected — задачи, отклонённые сразу: ожидающих уже max_waiting;
+    cancelled — вызывающие, отменённые до получения результата (задача в пуле доработает).
+    """
+    waiting: int = 0
+    queued: int = 0
+    completed: int = 0
+    failed: int = 0
+    rejected: int = 0
+    cancelled: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.completed += 1
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+
+    def snapshot(self) -> dict[str, Any]:
+        data = asdict(self)
+        data["avg_seconds"] = (
+            self.total_seconds / self.completed if self.completed else 0.0
+        )
+        return data
+
+
+class HasherOverloaded(HTTPException):
+    """Пул хеширования перегружен: задача отклонена без ожидания."""
+
+    def __init__(self):
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Password hashing is overloaded, retry later.",
+            headers={"Retry-After": "1"},
+        )
+
+
+class HashExecutor:
+    """
+    Выполняет argon2 в пуле процессов или потоков, не блокируя event loop.
+    Количество задач в пуле ограничено max_queue: остальные ждут своей очереди
+    в event loop, не занимая пул. Ожидающих не больше max_waiting — дальше
+    задачи отклоняются сразу (HasherOverloaded: 503 в HTTP, nack в AMQP).
+    """
+
+    def __init__(self, kind: str, workers: int, max_queue: int, max_waiting: int):
+        self.kind = kind
+        self.workers = workers
+        self.max_queue = max_queue
+        self.max_waiting = max_waiting
+        self.metrics = HasherMetrics()
+        self._executor: Executor | None = None
+        self._slots: asyncio.Semaphore | None = None
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.kind == "process":
+                # spawn — форк процесса с запущенным event loop небезопасен
+                # воркеры получают текущие (возможно откалиброванные) параметры HASHER
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=configure_hasher,
+                    initargs=(HASHER_PARAMS,),
+                )
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="hasher"
+                )
+        return self._executor
+
+    def _get_slots(self) -> asyncio.Semaphore:
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_queue)
+        return self._slots
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        if self.metrics.waiting >= self.max_waiting:
+            self.metrics.rejected += 1
+            raise HasherOverloaded()
+
+        slots = self._get_slots()
+        self.metrics.waiting += 1
+        try:
+            await slots.acquire()
+        finally:
+            self.metrics.waiting -= 1
+
+        # Слот принадлежит задаче в пуле, а не вызывающему: отмена вызывающего
+        # не останавливает задачу, поэтому слот освобождается по её завершении.
+        self.metrics.queued += 1
+        started = time.perf_counter()
+        try:
+            future = asyncio.wrap_future(self._get_executor().submit(func, *args))
+        except BaseException:
+            self.metrics.queued -= 1
+            slots.release()
+            raise
+
+        def on_done(done: asyncio.Future) -> None:
+            self.metrics.queued -= 1
+            slots.release()
+            if done.cancelled() or done.exception() is not None:
+                self.metrics.failed += 1
+            else:
+                self.metrics.observe(time.perf_counter() - started)
+
+        future.add_done_callback(on_done)
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            self.metrics.cancelled += 1
+            raise
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+hash_executor = HashExecutor(
+    kind=settings.hasher_executor,
+    workers=settings.hasher_workers,
+    max_queue=settings.hasher_max_queue,
+    max_waiting=settings.hasher_max_waiting,
+)
+
+
+async def hash_password_async(plain_password: str) -> str:
+    """
+    Асинхронный вариант hash_password — хеширование выполняется в пуле hash_executor.
+    """
+    if not isinstance(plain_password, str) or not plain_password:
+        raise ValueError("Пароль должен быть непустой строкой.")
+    return await hash_executor.run(hash_password, plain_password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    Асинхронный вариант verify_password — проверка выполняется в пуле hash_executor.
+    """
+    return await hash_executor.run(verify_password, plain_password, hashed_password)
+
+
+async def verify_and_update_password_async(
+    plain_password: str, hashed_password: str
+) -> tuple[bool, str | None]:
+    """
+    Асинхронный вариант verify_and_update_password — выполняется в пуле hash_executor.
+    """
+    return await hash_executor.run(
+        verify_and_update_password, plain_password, hashed_password
+    )
+
+
+# ---------- Хеширование API-ключей ----------
+# API-ключи — случайные 256-битные строки, подбор по словарю к ним неприменим,
+# поэтому memory-hard argon2 для них избыточен: достаточно HMAC-SHA256 с серверным
+# секретом (pepper). Схема хранится тегом в начале строки, как у argon2 (PHC-формат):
+#   $hmac-sha256$<hex>      — HMAC-SHA256(pepper, key)
+#   $argon2id$v=19$...      — legacy-ключи и ключи при отсутствии pepper
+API_KEY_HMAC_SCHEME = "hmac-sha256"
+_API_KEY_HMAC_TAG = f"${API_KEY_HMAC_SCHEME}$"
+
+def api_key_scheme(hashed_key: str) -> str:
+    """Возвращает схему, которой захеширован ключ: 'hmac-sha256' или 'argon2'."""
+    if hashed_key.startswith(_API_KEY_HMAC_TAG):
+        return API_KEY_HMAC_SCHEME
+    return "argon2"
+
+
+def _hmac_api_key(plain_key: str) -> str:
+    digest = hmac.new(
+        settings.api_key_pepper.encode(), plain_key.encode(), hashlib.sha256
+    ).hexdigest()
+    return f"{_API_KEY_HMAC_TAG}{digest}"
+
+
+async def hash_api_key(plain_key: str) -> str:
+    """
+    Хеширует API-ключ: HMAC-SHA256 с pepper, если он задан, иначе argon2 (в пуле).
+    """
+    if not isinstance(plain_key, str) or not plain_key:
+        raise ValueError("Ключ должен быть непустой строкой.")
+    if settings.api_key_pepper is None:
+        return await hash_password_async(plain_key)
+    return _hmac_api_key(plain_key)
+
+
+async def verify_api_key(plain_key: str, hashed_key: str) -> tuple[bool, bool]:
+    """
+    Проверяет API-ключ против хеша любой поддерживаемой схемы.
+    Возвращает (ключ верен, хеш нужно пересчитать в текущую схему).
+    """
+    if api_key_scheme(hashed_key) == API_KEY_HMAC_SCHEME:
+        if settings.api_key_pepper is None:
+            return False, False
+        return hmac.compare_digest(_hmac_api_key(plain_key), hashed_key), False
+
+    is_valid = await verify_password_async(plain_key, hashed_key)
+    return is_valid, is_valid and settings.api_key_pepper is not None
+
+
+if __name__ == "__main__":
+    # Калибровка из командной строки: python -m core.security --target-ms 250
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Подбор параметров argon2id под целевое время проверки")
+    parser.add_argument("--target-ms", type=float, default=settings.argon2_target_ms)
+    parser.add_argument("--memory-cost", type=int, default=settings.argon2_memory_cost, help="KiB")
+    parser.add_argument("--parallelism", type=int, default=settings.argon2_parallelism)
+    args = parser.parse_args()
+
+    tuned = calibrate_hasher(
+        target_ms=args.target_ms, memory_cost=args.memory_cost, parallelism=args.parallelism
+    )
+    print(f"# verify ≈ {measure_verify_ms(tuned):.1f} ms")
+    print(f"argon2_time_cost = {tuned.time_cost}")
+    print(f"argon2_memory_cost = {tuned.memory_cost}")
+    print(f"argon2_parallelism = {tuned.parallelism}")
@@ -1,17 +1,37 @@
+import asyncio
+import logging
 from fastapi import FastAPI
 import uvicorn
 from contextlib import asynccontextmanager
 from api import main_router
+from api.middlewares import SQLTimingMiddleware
 from amqp import main_broker
+from config import settings
+from core.database import databases
+from services.subscription.catalog import plan_catalog
+from core.security import hash_executor, calibrate_hasher, configure_hasher
+
+logger = logging.getLogger(__name__)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> None:
+    if settings.argon2_autotune:
+        params = await asyncio.to_thread(calibrate_hasher, settings.argon2_target_ms)
+        configure_hasher(params)
+        logger.info(f"argon2 parameters tuned to {params}")
+    await plan_catalog.refresh()
+    plan_catalog.start()
     await main_broker.start()
     yield
     await main_broker.close()
+    await plan_catalog.stop()
+    hash_executor.shutdown()
+    for db in databases:
+        await db.dispose()
 
 
 app = FastAPI(lifespan=lifespan)
+app.add_middleware(SQLTimingMiddleware)
 app.include_router(main_router)
 
 
@@ -1,23 +1,56 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, Result
+from sqlalchemy import select, update, Result
+import asyncio
+import logging
 import secrets
 from contracts.api_keys import APIKeyCreate, APIKeyCreateForm
 from core.models import APIKey
-from core.security import hash_password, HASHER
+from core.cache import api_key_cache, api_key_failures, fingerprint
+from core.security import hash_api_key, verify_api_key
+from services.crud import CRUD
 from services.error_handlers import DBErrorHandler
 from services.exceptions import APIKeyException
 
-async def create_key(form: APIKeyCreateForm, session: AsyncSession) -> str:
+logger = logging.getLogger(__name__)
+
+# Ключ выдаётся в виде "<prefix>.<secret>": prefix хранится открыто (индекс),
+# secret — только в виде хеша. token_urlsafe не содержит точек, поэтому разбор однозначен.
+KEY_SEPARATOR = "."
+PREFIX_BYTES = 6  # 12 hex-символов
+
+
+def split_api_key(key: str) -> str | None:
     """
-    Создаёт нового апи-ключа в базе данных.
-    Создаёт и хеширует ключ
+    Возвращает публичный префикс ключа.
+    Для ключей старого формата (без префикса) возвращает None.
     """
+    prefix, separator, secret = key.partition(KEY_SEPARATOR)
+    if not separator or not prefix or not secret:
+        return None
+    return prefix
 
-    key = secrets.token_urlsafe(32)
-    key_hash = hash_password(plain_password=key)
+
+async def _issue_key(form: APIKeyCreateForm) -> tuple[str, APIKeyCreate]:
+    """
+    Генерирует ключ вида "<prefix>.<secret>" и данные для сохранения:
+    хеш ключа (см. hash_api_key) и открытый префикс для быстрого поиска.
+    """
+    prefix = secrets.token_hex(PREFIX_BYTES)
+    key = f"{prefix}{KEY_SEPARATOR}{secrets.token_urlsafe(32)}"
+    key_hash = await hash_api_key(plain_key=key)
     data = form.model_dump()
     data["key"] = key_hash
-    created_data = APIKeyCreate(**data)
+    data["prefix"] = prefix
+    return key, APIKeyCreate(**data)
+
+
+async def create_key(form: APIKeyCreateForm, session: AsyncSession) -> str:
+    """
+    Создаёт нового апи-ключа в базе данных.
+    Создаёт и хеширует ключ (см. hash_api_key), префикс сохраняет открыто для быстрого поиска.
+    """
+
+    key, created_data = await _issue_key(form)
     session.add(APIKey(**created_data.model_dump()))
     try:
         await session.commit()
@@ -28,26 +61,95 @@ async def create_key(form: APIKeyCreateForm, session: AsyncSession) -> str:
     return key
 
 
-async def check_valid_api_key(key: str, service_id: int,  session: AsyncSession, raise_exception: bool = False) -> bool:
+async def create_many_keys(forms: list[APIKeyCreateForm], session: AsyncSession) -> list[str]:
     """
-    Проверяет, существует ли данный API-ключ в базе.
-    Ключи хранятся в виде хэшей (argon2), поэтому прямое сравнение невозможно.
+    Массово создаёт API-ключи одним INSERT (см. CRUD.create_many).
+    Возвращает сами ключи в порядке форм — в БД сохраняются только хеши.
     """
-    # Получаем все ключи (или оптимизируем выборку позже)
-    stmt = select(APIKey).where(APIKey.service_id == service_id)
+    issued = await asyncio.gather(*(_issue_key(form) for form in forms))
+    await CRUD.create_many(
+        data=[created_data for _, created_data in issued], model=APIKey, session=session
+    )
+    return [key for key, _ in issued]
+
+
+async def resolve_api_key(key: str, service_id: int, session: AsyncSession) -> int | None:
+    """
+    Находит API-ключ сервиса и возвращает его APIKey.id (или None, если ключ не подходит).
+    Ключи хранятся в виде хэшей (HMAC-SHA256 или legacy argon2), поэтому прямое сравнение невозможно:
+    - ключ с префиксом ищется одной выборкой по индексу и проверяется одним хешированием;
+    - ключ старого формата (без префикса) сверяется только с legacy-ключами сервиса.
+    Успешные проверки кешируются (api_key_cache) по HMAC-отпечатку ключа,
+    неудачные — в негативном кеше с лимитом на сервис (api_key_failures):
+    повторные и сверхлимитные попытки отклоняются без хеширования.
+    Legacy argon2-хеш при успешной проверке прозрачно пересчитывается в HMAC.
+    """
+    cache_key = (service_id, fingerprint(key))
+    cached_id = api_key_cache.get(cache_key)
+    if cached_id is not None:
+        return cached_id
+    if api_key_failures.is_known_bad(cache_key):
+        return None
+
+    prefix = split_api_key(key)
+    stmt = (
+        select(APIKey)
+        .where(APIKey.service_id == service_id)
+        .where(APIKey.is_active.is_(True))
+    )
+    if prefix is not None:
+        stmt = stmt.where(APIKey.prefix == prefix)
+    else:
+        stmt = stmt.where(APIKey.prefix.is_(None))
     try:
         result: Result = await session.execute(stmt)
         keys = result.scalars().all()
     except Exception as err:
         DBErrorHandler.handle(err=err, model=APIKey)
         await session.rollback()
-    # Проверяем каждый хэш
+    if not keys:
+        # совпадений нет — хеш не считался, лимит сервиса не расходуется
+        api_key_failures.record_failure(cache_key, hashed=False)
+        return None
+    if api_key_failures.is_throttled(service_id):
+        return None
+    # Проверяем хэш (для ключей с префиксом — ровно один)
     for db_key in keys:
-        try:
-            if HASHER.verify(db_key.key, key):
-                return True
-        except Exception:
+        is_valid, needs_rehash = await verify_api_key(plain_key=key, hashed_key=db_key.key)
+        if not is_valid:
             continue
+        if needs_rehash:
+            await _rehash_api_key(api_key_id=db_key.id, key=key, session=session)
+        api_key_cache.set(cache_key, db_key.id)
+        return db_key.id
+    api_key_failures.record_failure(cache_key, hashed=True)
+    return None
+
+
+async def _rehash_api_key(api_key_id: int, key: str, session: AsyncSession) -> None:
+    """
+    Пересчитывает хеш ключа в текущую схему.
+    Ошибка пересчёта не мешает авторизации — ключ будет обновлён при следующей проверке.
+    """
+    try:
+        await session.execute(
+            update(APIKey)
+            .where(APIKey.id == api_key_id)
+            .values(key=await hash_api_key(plain_key=key))
+        )
+        await session.commit()
+    except Exception:
+        await session.rollback()
+        logger.warning(f"Failed to rehash APIKey id={api_key_id}", exc_info=True)
+
+
+async def check_valid_api_key(key: str, service_id: int,  session: AsyncSession, raise_exception: bool = False) -> bool:
+    """
+    Проверяет, существует ли данный API-ключ в базе (см. resolve_api_key).
+    """
+    api_key_id = await resolve_api_key(key=key, service_id=service_id, session=session)
+    if api_key_id is not None:
+        return True
     if raise_exception:
         raise APIKeyException("Invalid APIKey")
     return False
@@ -1,5 +1,5 @@
-__all__ = "CRUD", "create_admin"
+__all__ = "CRUD", "loader_options", "create_admin", "create_many_admins", "authenticate_admin", "get_user_by_chat_id", "resolve_user_id"
 
-from .crud import CRUD
-from .admin.crud import create_admin
-from .user.crud import get_user_by_chat_id
\ No newline at end of file
+from .crud import CRUD, loader_options
+from .admin.crud import create_admin, create_many_admins, authenticate_admin
+from .user.crud import get_user_by_chat_id, resolve_user_id
\ No newline at end of file
@@ -1,9 +1,13 @@
+import asyncio
 from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime, timezone
 from sqlalchemy import select
-from fastapi import HTTPException
-from contracts.admin import AdminCreateForm, AdminReturn
+from fastapi import HTTPException, status
+from contracts.admin import AdminCreateForm, AdminCreate, AdminReturn, AdminLoginForm
+from contracts.bulk import OnConflict
 from core.models import Admin
-from core.security import hash_password
+from core.security import hash_password_async, verify_and_update_password_async
+from services.crud import CRUD
 from services.error_handlers import DBErrorHandler
 
 
@@ -21,7 +25,7 @@ async def create_admin(form: AdminCreateForm, session: AsyncSession) -> AdminRet
 
     # Подготовка данных
     data = form.model_dump(exclude_none=True)
-    data["hashed_password"] = hash_password(data.pop("password"))
+    data["hashed_password"] = await hash_password_async(data.pop("password"))
 
     # Создание и сохранение
     new_admin = Admin(**data)
@@ -36,3 +40,59 @@ async def create_admin(form: AdminCreateForm, session: AsyncSession) -> AdminRet
 
     # Возврат в виде Pydantic-схемы
     return AdminReturn.model_validate(new_admin)
+
+
+async def create_many_admins(
+    forms: list[AdminCreateForm],
+    session: AsyncSession,
+    on_conflict: OnConflict = OnConflict.error,
+) -> list[AdminReturn]:
+    """
+    Массово создаёт администраторов одним INSERT (см. CRUD.create_many).
+    Пароли хешируются параллельно в пуле hash_executor; конфликты — по email.
+    """
+    hashed_passwords = await asyncio.gather(
+        *(hash_password_async(form.password) for form in forms)
+    )
+    admins = await CRUD.create_many(
+        data=[
+            AdminCreate(**form.model_dump(exclude={"password"}), hashed_password=hashed)
+            for form, hashed in zip(forms, hashed_passwords)
+        ],
+        model=Admin,
+        session=session,
+        on_conflict=on_conflict,
+    )
+    return [AdminReturn.model_validate(admin) for admin in admins]
+
+
+async def authenticate_admin(form: AdminLoginForm, session: AsyncSession) -> AdminReturn:
+    """
+    Проверяет email и пароль администратора и отмечает время входа.
+    Если хеш пароля создан с устаревшими параметрами argon2 —
+    при успешном входе он пересчитывается с текущими параметрами.
+    """
+    admin = await session.scalar(select(Admin).where(Admin.email == form.email))
+    hashed_password = admin.hashed_password if admin else None
+
+    is_valid, new_hash = (False, None)
+    if hashed_password is not None:
+        is_valid, new_hash = await verify_and_update_password_async(
+            form.password, hashed_password
+        )
+    if not is_valid or not admin.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="Неверный email или пароль"
+        )
+
+    if new_hash is not None:
+        admin.hashed_password = new_hash
+    admin.last_login_at = datetime.now(tz=timezone.utc)
+
+    try:
+        await session.commit()
+    except Exception as err:
+        await session.rollback()
+        DBErrorHandler.handle(err=err, model=Admin, action="login")
+
+    return AdminReturn.model_validate(admin)
@@ -1,21 +1,62 @@
 from fastapi import HTTPException, status
 from mako.compat import exception_as
-from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.orm import DeclarativeBase, noload, selectinload, joinedload
+from sqlalchemy.orm.interfaces import ORMOption
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import insert, select, Result
+from sqlalchemy import insert, select, update, delete, inspect, tuple_, func, text, Result
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.exc import IntegrityError, DataError, OperationalError
 from pydantic import BaseModel
 
-from typing import TypeVar, Type, Union
+from typing import TypeVar, Type, Union, Literal, Sequence
 import logging
 
+from contracts.bulk import OnConflict
+from core.cache import invalidate_etag
+from contracts.pagination import PageParams, MAX_PAGE_SIZE
 from .error_handlers import DBErrorHandler
+from .filters import apply_filters, get_filter_spec, parse_sort_value
+from .pagination import CountResult, PageResult, encode_cursor, decode_cursor
 
 # универсальные дженерики
 ModelT = TypeVar("ModelT", bound=DeclarativeBase)
 SchemaT = TypeVar("SchemaT", bound=BaseModel)
 logger = logging.getLogger(__name__)
 
+LoadStrategy = Literal["noload", "selectin", "joined"]
+_LOADERS = {"noload": noload, "selectin": selectinload, "joined": joinedload}
+
+
+def loader_options(model: Type[ModelT], **strategies: LoadStrategy) -> list[ORMOption]:
+    """
+    💡 Явные стратегии загрузки связей модели для одного запроса.
+
+    Связи, указанные в `strategies`, грузятся выбранным способом,
+    все остальные — не грузятся (noload), вне зависимости от `lazy=` в модели.
+
+    Пример: `loader_options(User, payments="selectin")` — только платежи,
+    без подписок и сервисов.
+    """
+    relationships = inspect(model).relationships
+    unknown = set(strategies) - set(relationships.keys())
+    if unknown:
+        raise ValueError(f"{model.__name__} has no relationships: {', '.join(sorted(unknown))}")
+    return [
+        _LOADERS[strategies.get(name, "noload")](getattr(model, name))
+        for name in relationships.keys()
+    ]
+
+
+def unique_keys(model: Type[ModelT]) -> list[str]:
+    """
+    Колонки, по которым модель проверяет уникальность для ON CONFLICT:
+    первая уникальная колонка, кроме первичного ключа (например, User.chat_id).
+    """
+    for column in model.__table__.columns:
+        if column.unique and not column.primary_key:
+            return [column.key]
+    raise ValueError(f"{model.__name__} has no unique columns for ON CONFLICT")
+
 
 class CRUD:
     @staticmethod
@@ -51,34 +92,142 @@ class CRUD:
         finally:
             return instance
 
+    @staticmethod
+    async def create_many(
+        data: Sequence[SchemaT],
+        model: Type[ModelT],
+        session: AsyncSession,
+        on_conflict: OnConflict = OnConflict.error,
+        conflict_keys: Sequence[str] | None = None,
+        commit: bool = True,
+        options: Sequence[ORMOption] | None = None,
+    ) -> list[ModelT]:
+        """
+        💡 Массовое создание (upsert) ORM-сущностей.
+
+        Все строки вставляются одним `INSERT ... VALUES (...), (...) RETURNING *`
+        (insertmanyvalues — SQLAlchemy сам режет большие пачки на батчи),
+        вместо add/commit/refresh на каждую строку.
+
+        Args:
+            data: Pydantic-модели с данными (поля, которых нет среди колонок, игнорируются).
+            model: ORM-модель (дочерний класс Base).
+            session: Асинхронная сессия SQLAlchemy.
+            on_conflict: поведение при нарушении уникальности (см. OnConflict).
+            conflict_keys: колонки уникального индекса для ON CONFLICT;
+                по умолчанию — unique_keys(model).
+            commit: False — только выполнить INSERT в текущей транзакции
+                (для составных операций, коммит делает вызывающий код).
+            options: ORM-опции загрузки связей (см. loader_options); по умолчанию
+                связи не загружаются — у только что созданных записей их ещё нет.
+
+        Returns:
+            Созданные (и, при OnConflict.update, обновлённые) ORM-объекты.
+            При OnConflict.nothing пропущенные строки не возвращаются.
+
+        Raises:
+            HTTPException(400/503/500): при ошибках БД (через DBErrorHandler)
+        """
+        if not data:
+            return []
+
+        columns = inspect(model).column_attrs.keys()
+        rows = [
+            {field: value for field, value in item.model_dump().items() if field in columns}
+            for item in data
+        ]
+
+        stmt = pg_insert(model)
+        if on_conflict is not OnConflict.error:
+            keys = list(conflict_keys or unique_keys(model))
+            if on_conflict is OnConflict.update:
+                # одна строка не может обновиться дважды в одном запросе —
+                # из повторов по ключу оставляем последний
+                rows = list({tuple(row[key] for key in keys): row for row in rows}.values())
+                set_ = {
+                    name: stmt.excluded[name]
+                    for name in rows[0]
+                    if name not in keys and name != "id"
+                }
+                # onupdate колонки в ON CONFLICT DO UPDATE не применяется — версию поднимаем явно
+                if set_ and "version" in columns:
+                    set_["version"] = model.version + 1
+            if on_conflict is OnConflict.update and set_:
+                stmt = stmt.on_conflict_do_update(index_elements=keys, set_=set_)
+            else:
+                # DO NOTHING — и для OnConflict.update, если кроме ключа обновлять нечего
+                stmt = stmt.on_conflict_do_nothing(index_elements=keys)
+
+        try:
+            result = await session.scalars(
+                stmt.returning(model).options(
+                    *(loader_options(model) if options is None else options)
+                ),
+                rows,
+                execution_options={"populate_existing": True},
+            )
+            instances = list(result.all())
+            if commit:
+                await session.commit()
+            return instances
+        except HTTPException:
+            await session.rollback()
+            raise
+        except Exception as err:
+            await session.rollback()
+            DBErrorHandler.handle(err=err, model=model, action="bulk creating")
+
     @staticmethod
     async def get(
         model: Type[ModelT],
         session: AsyncSession,
         id: int | None = None,
-    ) -> Union[ModelT, list[ModelT]]:
+        page: PageParams | None = None,
+        options: Sequence[ORMOption] = (),
+        filters: BaseModel | None = None,
+    ) -> Union[ModelT, list[ModelT], PageResult]:
         """
         💡 Универсальный метод чтения данных из базы.
 
         Если передан `id`, возвращает одну запись по первичному ключу.
-        Если `id` не указан — возвращает список всех записей модели.
+        Если передан `page` — возвращает страницу записей (keyset-пагинация по `id`):
+        `WHERE id > :last_id ORDER BY id LIMIT :limit`, поэтому время ответа не зависит
+        от номера страницы и размера таблицы.
+        `filters` — схема фильтра модели (contracts.*.XxxFilter): условия и сортировка
+        берутся из белого списка FILTER_SPECS (только колонки с индексом).
+        Если не указано ни то, ни другое — возвращает список всех записей модели.
 
         Args:
             model: ORM-модель (дочерний класс Base)
             session: асинхронная сессия SQLAlchemy
             id: идентификатор записи (опционально)
+            page: параметры страницы (опционально)
+            options: ORM-опции загрузки связей (см. loader_options); по умолчанию —
+                стратегии `lazy=` из модели
+            filters: фильтр и сортировка списка (опционально)
 
         Returns:
-            Один объект модели или список всех объектов.
+            Один объект модели, страница (PageResult) или список всех объектов.
 
         Raises:
             HTTPException(404): если запись по id не найдена.
+            HTTPException(400): если курсор страницы или фильтр некорректен.
             HTTPException(400/503/500): если произошла SQL-ошибка (через DBErrorHandler).
         """
         try:
-            stmt = select(model)
+            stmt = select(model).options(*options)
             if id is not None:
                 stmt = stmt.where(model.id == id)
+            else:
+                stmt = apply_filters(stmt, model, filters)
+                if page is not None:
+                    return await CRUD._get_page(
+                        stmt=stmt,
+                        model=model,
+                        session=session,
+                        page=page,
+                        sort=getattr(filters, "sort", None),
+                    )
 
             result: Result = await session.execute(stmt)
             data = result.scalars().all()
@@ -97,18 +246,110 @@ class CRUD:
             # Любая ошибка SQLAlchemy или инфраструктуры
             DBErrorHandler.handle(err=err, model=model)
 
+    @staticmethod
+    async def _get_page(
+        stmt, model: Type[ModelT], session: AsyncSession, page: PageParams, sort: str | None = None
+    ) -> PageResult:
+        """
+        Выбирает одну страницу по курсору. Берём limit + 1 строку,
+        чтобы узнать, есть ли следующая страница, без отдельного COUNT.
+
+        При сортировке не по id курсор хранит пару (значение сортировки, id):
+        `WHERE (col, id) > (:value, :id) ORDER BY col, id` — id разрешает равные значения.
+        """
+        sort_name, column, descending = get_filter_spec(model).sort_key(sort)
+        by_id = sort_name == "id"
+        keys = (model.id,) if by_id else (column, model.id)
+
+        limit = min(page.limit, MAX_PAGE_SIZE)
+        if page.cursor is not None:
+            payload = decode_cursor(page.cursor)
+            last_id = payload.get("id")
+            if not isinstance(last_id, int) or (not by_id and payload.get("sort") != sort_name):
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Invalid pagination cursor.",
+                )
+            if by_id:
+                current, position = model.id, last_id
+            else:
+                current = tuple_(column, model.id)
+                position = tuple_(parse_sort_value(column, payload.get("value")), last_id)
+            stmt = stmt.where(current < position if descending else current > position)
+        stmt = stmt.order_by(*(key.desc() if descending else key for key in keys)).limit(limit + 1)
+
+        result: Result = await session.execute(stmt)
+        items = list(result.scalars().all())
+        next_cursor = None
+        if len(items) > limit:
+            items = items[:limit]
+            last = items[-1]
+            next_cursor = encode_cursor(
+                {"id": last.id}
+                if by_id
+                else {"sort": sort_name, "value": getattr(last, column.key), "id": last.id}
+            )
+        return PageResult(items=items, next_cursor=next_cursor)
+
+    @staticmethod
+    async def count(
+        model: Type[ModelT],
+        session: AsyncSession,
+        filters: BaseModel | None = None,
+        approximate: bool = False,
+    ) -> CountResult:
+        """
+        💡 Количество записей модели.
+
+        - Точный режим — `SELECT count(*) ... WHERE <фильтры>`; фильтры берутся
+          из того же белого списка, что и у списков (FILTER_SPECS), поэтому
+          подсчёт идёт по индексу, а не последовательным сканированием.
+        - approximate=True без фильтров — оценка по статистике планировщика
+          (`pg_class.reltuples`), O(1) для таблицы любого размера. Если статистики
+          ещё нет (таблица не анализировалась, reltuples = -1) — точный подсчёт.
+
+        Args:
+            model: ORM-модель (дочерний класс Base)
+            session: асинхронная сессия SQLAlchemy
+            filters: фильтр модели (опционально)
+            approximate: разрешить оценку по статистике
+
+        Returns:
+            CountResult(count, approximate) — approximate=True, если это оценка.
+
+        Raises:
+            HTTPException(400): если фильтр некорректен
+            HTTPException(400/503/500): при ошибках БД (через DBErrorHandler)
+        """
+        conditions = get_filter_spec(model).where(filters) if filters is not None else []
+        try:
+            if approximate and not conditions:
+                estimate = await session.scalar(
+                    text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table)"),
+                    {"table": f'"{model.__table__.name}"'},
+                )
+                if estimate is not None and estimate >= 0:
+                    return CountResult(count=estimate, approximate=True)
+
+            stmt = select(func.count()).select_from(model).where(*conditions)
+            return CountResult(count=await session.scalar(stmt), approximate=False)
+        except Exception as err:
+            DBErrorHandler.handle(err=err, model=model, action="counting")
+
     @staticmethod
     async def patch(
         new_data: SchemaT,
         model: Type[ModelT],
         session: AsyncSession,
         id: int,
+        options: Sequence[ORMOption] = (),
     ) -> ModelT:
         """
         💡 Универсальное обновление записи (частичное).
 
-        Обновляет только те поля, которые переданы в Pydantic-модели `new_data`.
-        Если запись с указанным id не найдена, выбрасывает 404.
+        Обновляет только те поля, которые переданы в Pydantic-модели `new_data`,
+        одним запросом `UPDATE ... WHERE id = :id RETURNING *` (без SELECT и refresh).
+        Если запись с указанным id не найдена (0 строк), выбрасывает 404.
         Все ошибки SQLAlchemy обрабатываются через DBErrorHandler.
 
         Args:
@@ -116,6 +357,8 @@ class CRUD:
             model: ORM-модель
             session: асинхронная сессия SQLAlchemy
             id: идентификатор записи
+            options: ORM-опции загрузки связей (см. loader_options) — связи
+                перезагружаются, только если они нужны ответу
 
         Returns:
             Обновлённый ORM-объект
@@ -124,8 +367,31 @@ class CRUD:
             HTTPException(404): если запись не найдена
             HTTPException(400/503/500): при ошибках БД
         """
+        # exclude_unset → обновляем только реально переданные поля;
+        # поля, которых нет среди колонок модели (например, password), игнорируются
+        columns = inspect(model).column_attrs.keys()
+        update_data = {
+            field: value
+            for field, value in new_data.model_dump(exclude_unset=True).items()
+            if field in columns
+        }
+
+        # Защита: не даём обновить первичный ключ и версию (её поднимает БД)
+        update_data.pop("id", None)
+        update_data.pop("version", None)
+
+        if not update_data:
+            return await CRUD.get(model=model, session=session, id=id, options=options)
+
         try:
-            stmt = select(model).where(model.id == id)
+            stmt = (
+                update(model)
+                .where(model.id == id)
+                .values(**update_data)
+                .returning(model)
+                .options(*options)
+                .execution_options(populate_existing=True)
+            )
             result: Result = await session.execute(stmt)
             instance = result.scalars().first()
 
@@ -135,21 +401,11 @@ class CRUD:
                     detail=f"{model.__name__} with id={id} not found.",
                 )
 
-            # exclude_unset → обновляем только реально переданные поля
-            update_data = new_data.model_dump(exclude_unset=True)
-
-            # Защита: не даём обновить первичный ключ
-            update_data.pop("id", None)
-
-            for field, value in update_data.items():
-                setattr(instance, field, value)
-
-            session.add(instance)
             await session.commit()
-            await session.refresh(instance)
-
+            invalidate_etag(model.__table__.name, id)
             return instance
         except HTTPException:
+            await session.rollback()
             raise
         except Exception as err:
             await session.rollback()
@@ -160,14 +416,24 @@ class CRUD:
         model: Type[ModelT],
         session: AsyncSession,
         id: int,
+        db_cascade: bool = False,
     ) -> str:
         """
         💡 Удаляет запись по ID.
 
+        Два режима:
+        - по умолчанию — через ORM: SELECT записи и `session.delete()`;
+          каскады `cascade="all, delete-orphan"` выполняет ORM, загружая и удаляя
+          дочерние записи по одной;
+        - `db_cascade=True` — один запрос `DELETE ... WHERE id = :id RETURNING id`,
+          дочерние записи обрабатывает сама БД по `ondelete=` внешних ключей
+          (CASCADE удаляет, SET NULL — отвязывает, например платежи пользователя).
+
         Args:
             model: ORM-модель (дочерний класс Base)
             session: асинхронная сессия SQLAlchemy
             id: идентификатор записи для удаления
+            db_cascade: удалить одним запросом, полагаясь на ondelete внешних ключей
 
         Returns:
             Строка `"ok"` при успешном удалении.
@@ -177,20 +443,34 @@ class CRUD:
             HTTPException(400/503/500): при ошибках БД (через DBErrorHandler)
         """
         try:
-            stmt = select(model).where(model.id == id)
-            result: Result = await session.execute(stmt)
-            instance: ModelT | None = result.scalars().first()
-
-            if not instance:
+            if db_cascade:
+                stmt = (
+                    delete(model)
+                    .where(model.id == id)
+                    .returning(model.id)
+                    .execution_options(synchronize_session=False)
+                )
+                result: Result = await session.execute(stmt)
+                deleted_id = result.scalar_one_or_none()
+            else:
+                stmt = select(model).where(model.id == id)
+                result: Result = await session.execute(stmt)
+                instance: ModelT | None = result.scalars().first()
+                deleted_id = instance.id if instance else None
+                if instance:
+                    await session.delete(instance)
+
+            if deleted_id is None:
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND,
                     detail=f"{model.__name__} with id={id} not found.",
                 )
 
-            await session.delete(instance)
             await session.commit()
+            invalidate_etag(model.__table__.name, id)
             return "ok"
         except HTTPException:
+            await session.rollback()
             raise
         except Exception as err:
             await session.rollback()
@@ -0,0 +1,123 @@
+import hashlib
+from typing import Any, Sequence, Type, TypeVar
+
+from fastapi import Request, Response, status
+from sqlalchemy import func, inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.orm.interfaces import ORMOption
+
+from config import settings
+from core.cache import etag_cache
+from .crud import CRUD
+from .serialization import json_response
+
+ModelT = TypeVar("ModelT", bound=DeclarativeBase)
+
+# Описание условного ответа для OpenAPI
+NOT_MODIFIED_RESPONSE = {
+    304: {"description": "Сущность не изменилась (ETag совпал с If-None-Match)"}
+}
+
+# ETag сущности строится из её версии и «отпечатка» каждой вложенной коллекции ответа:
+# (количество, max(id), sum(version)). Вставка меняет count/max(id), удаление — count,
+# изменение любой дочерней строки — sum(version).
+
+
+def _make_etag(values: Sequence[int]) -> str:
+    digest = hashlib.blake2b(":".join(map(str, values)).encode(), digest_size=8)
+    return f'"{digest.hexdigest()}"'
+
+
+def instance_etag(instance: DeclarativeBase, relationships: Sequence[str] = ()) -> str:
+    """ETag уже загруженной сущности (связи relationships должны быть загружены)."""
+    values = [instance.version]
+    for name in relationships:
+        children = getattr(instance, name)
+        values += [
+            len(children),
+            max((child.id for child in children), default=0),
+            sum(child.version for child in children),
+        ]
+    return _make_etag(values)
+
+
+async def fetch_etag(
+    model: Type[ModelT], id: int, session: AsyncSession, relationships: Sequence[str] = ()
+) -> str | None:
+    """
+    ETag сущности одним запросом — без загрузки самой сущности и её связей:
+    версия строки по первичному ключу и агрегаты дочерних таблиц по индексированным FK
+    (коррелированные подзапросы). None — сущность не найдена.
+    """
+    key = (model.__table__.name, id)
+    if settings.etag_cache_ttl > 0 and (cached := etag_cache.get(key)) is not None:
+        return cached
+
+    columns = [model.version]
+    mapper = inspect(model)
+    for name in relationships:
+        relationship = mapper.relationships[name]
+        child = relationship.mapper.class_
+        columns += [
+            select(aggregate).where(relationship.primaryjoin).scalar_subquery()
+            for aggregate in (
+                func.count(child.id),
+                func.coalesce(func.max(child.id), 0),
+                func.coalesce(func.sum(child.version), 0),
+            )
+        ]
+    row = (await session.execute(select(*columns).where(model.id == id))).first()
+    if row is None:
+        return None
+    etag = _make_etag(row)
+    if settings.etag_cache_ttl > 0:
+        etag_cache.set(key, etag)
+    return etag
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Сравнение If-None-Match с ETag (слабое сравнение, RFC 9110 §13.1.2)."""
+    if if_none_match.strip() == "*":
+        return True
+    return any(
+        candidate.strip().removeprefix("W/") == etag for candidate in if_none_match.split(",")
+    )
+
+
+async def get_with_etag(
+    request: Request,
+    response: Response,
+    model: Type[ModelT],
+    session: AsyncSession,
+    id: int,
+    relationships: Sequence[str] = (),
+    options: Sequence[ORMOption] = (),
+    schema: Any = None,
+) -> ModelT | Response:
+    """
+    💡 Условный GET сущности по id.
+
+    Если клиент прислал If-None-Match и ETag не изменился — 304 после одного
+    лёгкого запроса (fetch_etag) или сразу из кеша, без загрузки и сериализации.
+    Иначе сущность загружается как обычно (CRUD.get), а ETag считается
+    по загруженному объекту без дополнительного запроса.
+
+    relationships — вложенные коллекции ответа, изменения которых меняют ETag.
+    schema — если задана, ответ сразу сериализуется быстрым путём (json_response)
+    с заголовком ETag; иначе возвращается ORM-объект, а ETag ставится в response.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        etag = await fetch_etag(model, id, session, relationships)
+        if etag is not None and etag_matches(if_none_match, etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+    instance = await CRUD.get(model=model, session=session, id=id, options=options)
+    etag = instance_etag(instance, relationships)
+    if settings.etag_cache_ttl > 0:
+        etag_cache.set((model.__table__.name, id), etag)
+    if schema is not None:
+        return json_response(schema, instance, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    return instance
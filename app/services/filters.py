@@ -0,0 +1,176 @@
+import operator
+from dataclasses import dataclass, field
+from typing import Any, Callable, Type, TypeVar
+
+from fastapi import HTTPException, status
+from pydantic import BaseModel, TypeAdapter, ValidationError
+from sqlalchemy import Column, Select, UniqueConstraint
+from sqlalchemy.orm import DeclarativeBase, InstrumentedAttribute
+
+from core.models import APIKey, Payment, User, UserService, UserSubscription
+
+ModelT = TypeVar("ModelT", bound=DeclarativeBase)
+
+_OPERATORS: dict[str, Callable[[Any, Any], Any]] = {
+    "eq": operator.eq,
+    "gte": operator.ge,
+    "lte": operator.le,
+}
+
+
+def has_leading_index(column: Column) -> bool:
+    """
+    Есть ли у колонки индекс, в котором она стоит первой:
+    первичный ключ, Index или UNIQUE-ограничение (в PostgreSQL — тоже индекс).
+    Только такие колонки позволяют выбрать строки без последовательного сканирования.
+    """
+    table = column.table
+    candidates = [list(table.primary_key.columns)]
+    candidates += [list(index.columns) for index in table.indexes]
+    candidates += [
+        list(constraint.columns)
+        for constraint in table.constraints
+        if isinstance(constraint, UniqueConstraint)
+    ]
+    return any(columns and columns[0] is column for columns in candidates)
+
+
+@dataclass(frozen=True)
+class FilterField:
+    """
+    Поле фильтра: колонка, оператор сравнения и (опционально) связь,
+    через которую фильтруется родительская модель — `relationship.any(...)` (EXISTS).
+
+    indexed=False — «уточняющее» поле (например, is_active): допускается только
+    вместе с хотя бы одним индексированным полем.
+    """
+
+    column: InstrumentedAttribute
+    op: str = "eq"
+    via: InstrumentedAttribute | None = None
+    indexed: bool = True
+
+    def clause(self, value: Any):
+        condition = _OPERATORS[self.op](self.column, value)
+        return self.via.any(condition) if self.via is not None else condition
+
+
+@dataclass(frozen=True)
+class FilterSpec:
+    """
+    💡 Белый список фильтров и сортировок модели.
+
+    fields — поле схемы фильтра (contracts.*.XxxFilter) → FilterField;
+    sortable — имя сортировки → колонка (NOT NULL, с индексом);
+    `-name` в запросе означает сортировку по убыванию.
+
+    Индексы проверяются при импорте: поле, помеченное indexed, или сортировка
+    по колонке без индекса — ошибка конфигурации, а не медленный запрос в проде.
+    """
+
+    model: Type[DeclarativeBase]
+    fields: dict[str, FilterField] = field(default_factory=dict)
+    sortable: dict[str, InstrumentedAttribute] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        for name, filter_field in self.fields.items():
+            if filter_field.indexed and not has_leading_index(filter_field.column.property.columns[0]):
+                raise ValueError(f"{self.model.__name__} filter {name!r} has no supporting index")
+        for name, attr in {"id": self.model.id, **self.sortable}.items():
+            column = attr.property.columns[0]
+            if column.nullable or not has_leading_index(column):
+                raise ValueError(f"{self.model.__name__} sort {name!r} needs a NOT NULL indexed column")
+
+    def where(self, filters: BaseModel) -> list:
+        """
+        Превращает заполненные поля фильтра в условия WHERE.
+        Если заданы только неиндексированные поля — 400 (запрос ушёл бы в seq scan).
+        """
+        values = {
+            name: value
+            for name, value in filters.model_dump(exclude_none=True).items()
+            if name in self.fields
+        }
+        if values and not any(self.fields[name].indexed for name in values):
+            indexed = sorted(name for name, f in self.fields.items() if f.indexed)
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Filter requires one of: {', '.join(indexed)}.",
+            )
+        return [self.fields[name].clause(value) for name, value in values.items()]
+
+    def sort_key(self, sort: str | None) -> tuple[str, InstrumentedAttribute, bool]:
+        """Возвращает (имя сортировки, колонка, по убыванию)."""
+        name = (sort or "id").lstrip("-")
+        column = self.model.id if name == "id" else self.sortable.get(name)
+        if column is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail=f"Unsupported sort: {sort}."
+            )
+        return name, column, bool(sort and sort.startswith("-"))
+
+
+def parse_sort_value(column: InstrumentedAttribute, raw: Any) -> Any:
+    """Восстанавливает значение сортировки из курсора (JSON) в тип колонки."""
+    try:
+        return TypeAdapter(column.type.python_type).validate_python(raw)
+    except (ValidationError, NotImplementedError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid pagination cursor."
+        )
+
+
+FILTER_SPECS: dict[Type[DeclarativeBase], FilterSpec] = {
+    spec.model: spec
+    for spec in (
+        FilterSpec(
+            model=User,
+            fields={
+                "chat_id": FilterField(User.chat_id),
+                "service_id": FilterField(UserService.service_id, via=User.services),
+                "language": FilterField(User.language, indexed=False),
+            },
+        ),
+        FilterSpec(
+            model=Payment,
+            fields={
+                "user_id": FilterField(Payment.user_id),
+                "created_from": FilterField(Payment.created_at, op="gte"),
+                "created_to": FilterField(Payment.created_at, op="lte"),
+                "provider": FilterField(Payment.provider, indexed=False),
+                "succeeded": FilterField(Payment.succeeded, indexed=False),
+            },
+            sortable={"created_at": Payment.created_at},
+        ),
+        FilterSpec(
+            model=UserSubscription,
+            fields={
+                "user_id": FilterField(UserSubscription.user_id),
+                "subscription_id": FilterField(UserSubscription.subscription_id),
+                "active": FilterField(UserSubscription.active),
+            },
+        ),
+        FilterSpec(
+            model=APIKey,
+            fields={
+                "service_id": FilterField(APIKey.service_id),
+                "is_active": FilterField(APIKey.is_active, indexed=False),
+            },
+        ),
+    )
+}
+
+
+def get_filter_spec(model: Type[ModelT]) -> FilterSpec:
+    spec = FILTER_SPECS.get(model)
+    if spec is None:
+        # без спецификации — только пагинация по id, без фильтров
+        spec = FilterSpec(model=model)
+    return spec
+
+
+def apply_filters(stmt: Select, model: Type[ModelT], filters: BaseModel | None) -> Select:
+    """Добавляет к запросу условия фильтра модели (см. FilterSpec.where)."""
+    if filters is None:
+        return stmt
+    return stmt.where(*get_filter_spec(model).where(filters))
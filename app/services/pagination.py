@@ -0,0 +1,55 @@
+import base64
+import binascii
+import json
+from typing import Any
+
+from fastapi import HTTPException, status
+
+
+class PageResult:
+    """
+    Страница ORM-объектов. Валидируется в contracts.pagination.Page[...] по атрибутам.
+
+    Не dataclass: FastAPI прогоняет dataclass-ответ через dataclasses.asdict(),
+    а это глубокая копия каждой ORM-строки страницы (вместе с InstanceState).
+    """
+
+    __slots__ = ("items", "next_cursor")
+
+    def __init__(self, items: list[Any] | None = None, next_cursor: str | None = None):
+        self.items = items if items is not None else []
+        self.next_cursor = next_cursor
+
+
+class CountResult:
+    """
+    Результат CRUD.count. Валидируется в contracts.pagination.CountReturn.
+    """
+
+    __slots__ = ("count", "approximate")
+
+    def __init__(self, count: int, approximate: bool = False):
+        self.count = count
+        self.approximate = approximate
+
+
+def encode_cursor(payload: dict[str, Any]) -> str:
+    """Кодирует позицию keyset-пагинации в непрозрачный url-safe токен."""
+    raw = json.dumps(payload, separators=(",", ":"), default=str).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str) -> dict[str, Any]:
+    """
+    Декодирует курсор. Некорректный курсор — ошибка клиента (400).
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, ValueError, UnicodeDecodeError):
+        payload = None
+    if not isinstance(payload, dict):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid pagination cursor."
+        )
+    return payload
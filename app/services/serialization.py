@@ -0,0 +1,43 @@
+from functools import lru_cache
+from typing import Any, Mapping
+
+from fastapi import Response, status
+from pydantic import TypeAdapter
+
+JSON_MEDIA_TYPE = "application/json"
+
+
+@lru_cache(maxsize=None)
+def type_adapter(response_type: Any) -> TypeAdapter:
+    """
+    TypeAdapter для типа ответа (схема, list[...] или Page[...]).
+    Схема валидации/сериализации компилируется один раз на тип, а не на запрос.
+    """
+    return TypeAdapter(response_type)
+
+
+def json_response(
+    response_type: Any,
+    content: Any,
+    status_code: int = status.HTTP_200_OK,
+    exclude_none: bool = True,
+    headers: Mapping[str, str] | None = None,
+) -> Response:
+    """
+    💡 Быстрый путь ответа: модель ответа строится из атрибутов ORM-объекта
+    один раз и сразу сериализуется в JSON-байты ядром pydantic (Rust).
+
+    При `return orm_object` FastAPI валидирует ответ по response_model, выгружает его
+    в dict, прогоняет через jsonable_encoder и json.dumps — для вложенных списков
+    (подписки, платежи, сервисы) это основная часть времени запроса.
+    Response возвращается как есть, поэтому response_model в декораторе
+    остаётся только для документации OpenAPI.
+    """
+    adapter = type_adapter(response_type)
+    value = adapter.validate_python(content, from_attributes=True)
+    return Response(
+        content=adapter.dump_json(value, exclude_none=exclude_none),
+        status_code=status_code,
+        media_type=JSON_MEDIA_TYPE,
+        headers=headers,
+    )
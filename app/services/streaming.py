@@ -0,0 +1,70 @@
+from typing import AsyncIterator, Sequence, Type, TypeVar
+
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from sqlalchemy import Select, select
+from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.orm.interfaces import ORMOption
+
+from core.database import database
+from .filters import apply_filters
+
+ModelT = TypeVar("ModelT", bound=DeclarativeBase)
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+STREAM_BATCH_SIZE = 1000  # строк на один fetch серверного курсора
+
+# Описание альтернативного ответа списков для OpenAPI
+NDJSON_RESPONSE = {
+    200: {
+        "content": {NDJSON_MEDIA_TYPE: {}},
+        "description": f"Все записи потоком, по одной JSON-строке (Accept: {NDJSON_MEDIA_TYPE})",
+    }
+}
+
+
+def accepts_ndjson(request: Request) -> bool:
+    """Клиент запросил потоковую выдачу (Accept: application/x-ndjson)."""
+    return NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+async def stream_ndjson(
+    stmt: Select, schema: Type[BaseModel], batch_size: int = STREAM_BATCH_SIZE
+) -> AsyncIterator[bytes]:
+    """
+    💡 Выдаёт результат запроса в формате NDJSON, не загружая его в память.
+
+    Строки читаются серверным курсором (`AsyncSession.stream_scalars` + `yield_per`)
+    пачками по batch_size; каждая пачка сериализуется и отправляется клиенту.
+    Identity map сессии хранит объекты по слабым ссылкам, поэтому отправленные
+    пачки освобождаются сборщиком мусора.
+
+    Сессия открывается здесь, а не берётся из зависимости: тело ответа
+    отправляется уже после выхода из view. Чтение — из реплики, если она настроена.
+    """
+    async with database.read_session() as session:
+        result = await session.stream_scalars(stmt.execution_options(yield_per=batch_size))
+        async for partition in result.partitions():
+            yield b"".join(
+                schema.model_validate(row).model_dump_json(exclude_none=True).encode() + b"\n"
+                for row in partition
+            )
+
+
+def ndjson_response(
+    model: Type[ModelT],
+    schema: Type[BaseModel],
+    options: Sequence[ORMOption] = (),
+    filters: BaseModel | None = None,
+) -> StreamingResponse:
+    """
+    StreamingResponse со всеми записями модели в формате NDJSON (см. stream_ndjson).
+    filters — те же фильтры, что и у постраничного списка (см. services/filters.py);
+    порядок — всегда по id. Запрос собирается до начала ответа, чтобы ошибка
+    фильтра вернулась обычным 400, а не оборвала поток.
+    """
+    stmt = apply_filters(select(model).options(*options), model, filters).order_by(model.id)
+    return StreamingResponse(
+        stream_ndjson(stmt=stmt, schema=schema), media_type=NDJSON_MEDIA_TYPE
+    )
@@ -0,0 +1,146 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from decimal import Decimal
+
+from fastapi import HTTPException, status
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config import settings
+from core.database import database
+from core.models import Subscription
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Plan:
+    """
+    Тариф из каталога — неизменяемый снимок строки Subscription (без связей).
+    """
+    id: int
+    name: str
+    description: str | None
+    term_days: int
+    price: Decimal
+    sale_percent: int
+    is_trial_available: bool
+    version: int
+
+
+PLAN_COLUMNS = tuple(Subscription.__table__.c[name] for name in Plan.__dataclass_fields__)
+
+
+class PlanCatalog:
+    """
+    💡 Каталог тарифов в памяти процесса.
+
+    Таблица Subscription маленькая и меняется редко, поэтому подписка и проверка
+    подписки берут тариф отсюда, не обращаясь к БД (и не подгружая selectin-ом
+    все UserSubscription тарифа).
+
+    Обновление:
+    - при старте приложения (load);
+    - после создания/изменения/удаления тарифа через API (refresh);
+    - страховка от изменений из других процессов — фоновая проверка токена версии
+      (count, max(id), sum(version)) раз в check_interval секунд и при промахе,
+      но не чаще раза в miss_check_interval: запросы с несуществующим id
+      не должны превращаться в поток запросов к БД.
+    """
+
+    def __init__(self, check_interval: float, miss_check_interval: float):
+        self.check_interval = check_interval
+        self.miss_check_interval = miss_check_interval
+        self._plans: dict[int, Plan] = {}
+        self._token: tuple | None = None
+        self._checked_at = float("-inf")
+        self._lock = asyncio.Lock()
+        self._task: asyncio.Task | None = None
+
+    @staticmethod
+    async def _fetch_token(session: AsyncSession) -> tuple:
+        result = await session.execute(
+            select(
+                func.count(Subscription.id),
+                func.coalesce(func.max(Subscription.id), 0),
+                func.coalesce(func.sum(Subscription.version), 0),
+            )
+        )
+        return tuple(result.one())
+
+    async def refresh(self, force: bool = True) -> bool:
+        """
+        Перечитывает каталог. force=False — только если изменился токен версии.
+        Возвращает True, если каталог был перезагружен.
+        """
+        async with self._lock:
+            self._checked_at = time.monotonic()
+            async with database.session_maker() as session:
+                token = await self._fetch_token(session)
+                if not force and token == self._token:
+                    return False
+                rows = await session.execute(select(*PLAN_COLUMNS))
+                self._plans = {row.id: Plan(**row._asdict()) for row in rows}
+                self._token = token
+        logger.info(f"Plan catalog loaded: {len(self._plans)} plans")
+        return True
+
+    async def refresh_after_change(self) -> None:
+        """
+        Обновление после изменения тарифа через API. Изменение уже сохранено,
+        поэтому ошибка обновления не должна превращать ответ в 500:
+        каталог догонит фоновая проверка версии.
+        """
+        try:
+            await self.refresh()
+        except Exception:
+            logger.warning("Plan catalog refresh after change failed", exc_info=True)
+
+    async def get(self, plan_id: int) -> Plan:
+        """Тариф по id; 404 — если его нет и после проверки версии."""
+        plan = self._plans.get(plan_id)
+        if plan is None:
+            # каталог ещё не загружен или тариф создан в другом процессе
+            if self._token is None:
+                await self.refresh()
+            elif time.monotonic() - self._checked_at >= self.miss_check_interval:
+                # отметка до await — параллельные промахи не встают в очередь за lock
+                self._checked_at = time.monotonic()
+                await self.refresh(force=False)
+            plan = self._plans.get(plan_id)
+        if plan is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Subscription with id={plan_id} not found.",
+            )
+        return plan
+
+    async def _watch(self) -> None:
+        while True:
+            await asyncio.sleep(self.check_interval)
+            try:
+                await self.refresh(force=False)
+            except Exception:
+                logger.warning("Plan catalog version check failed", exc_info=True)
+
+    def start(self) -> None:
+        """Запускает фоновую проверку версии каталога."""
+        if self._task is None and self.check_interval > 0:
+            self._task = asyncio.create_task(self._watch())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+plan_catalog = PlanCatalog(
+    check_interval=settings.plan_catalog_check_interval,
+    miss_check_interval=settings.plan_catalog_miss_check_interval,
+)
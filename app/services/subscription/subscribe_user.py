@@ -1,15 +1,24 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, Result
+from sqlalchemy import select, exists, func, or_, update
 from datetime import timedelta, datetime, timezone
 from fastapi import HTTPException, status
-from core.models import Subscription, UserSubscription, User
+from core.cache import user_id_cache
+from core.models import User, UserSubscription
 from contracts.subscriptions import (
     SubscribeUserCreate,
     SubscribeUserReturn,
     SubscribeUserCreateForm,
 )
-from services import CRUD
-from services.user.crud import get_user_by_chat_id
+from services.user.crud import resolve_user_id
+from services.subscription.catalog import plan_catalog
+
+
+def _not_expired():
+    """Подписка действует: срок не задан или ещё не истёк."""
+    return or_(
+        UserSubscription.expires_at.is_(None),
+        UserSubscription.expires_at > func.now(),
+    )
 
 
 async def subscribe(
@@ -20,34 +29,45 @@ async def subscribe(
     💡 Создаёт запись подписки пользователя на конкретный тариф.
 
     Логика:
-    1. Проверяет существование пользователя (по chat_id) и подписки (по id).
+    1. Проверяет существование пользователя (по chat_id) и подписки (по id, из каталога тарифов).
     2. Вычисляет дату окончания подписки, если у тарифа задан срок (term_days > 0).
     3. Создаёт новую запись `UserSubscription`, активируя её.
     4. Возвращает данные о подписке в формате Pydantic-схемы `SubscribeUserReturn`.
 
     Исключения:
     - 404 Not Found — если пользователь или подписка не найдены (обрабатывается вспомогательными функциями).
-    - 400 Bad Request — если пользователь уже имеет активную подписку на тот же тариф.
+    - 400 Bad Request — если пользователь уже имеет действующую подписку на тот же тариф.
+
+    Истёкшие, но ещё active-подписки на этот тариф деактивируются в той же транзакции —
+    иначе пользователь не смог бы продлить тариф (см. check_user_subscribe).
     """
 
     # 1. Получаем пользователя и подписку (функции сами бросят 404, если не найдут)
-    user: User = await get_user_by_chat_id(chat_id=data.chat_id, session=session)
-    subscription: Subscription = await CRUD.get(
-        model=Subscription, id=data.subscription_id, session=session
-    )
+    user_id = await resolve_user_id(chat_id=data.chat_id, session=session)
+    subscription = await plan_catalog.get(data.subscription_id)
 
-    # 2. Проверяем — нет ли уже активной подписки на этот тариф
+    # 2. Проверяем — нет ли уже действующей подписки на этот тариф
     existing_sub = await session.scalar(
         select(UserSubscription)
-        .where(UserSubscription.user_id == user.id)
+        .where(UserSubscription.user_id == user_id)
         .where(UserSubscription.subscription_id == subscription.id)
         .where(UserSubscription.active.is_(True))
+        .where(_not_expired())
     )
     if existing_sub:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="User already has an active subscription to this plan.",
         )
+    # истёкшие подписки больше не активны
+    await session.execute(
+        update(UserSubscription)
+        .where(UserSubscription.user_id == user_id)
+        .where(UserSubscription.subscription_id == subscription.id)
+        .where(UserSubscription.active.is_(True))
+        .where(UserSubscription.expires_at <= func.now())
+        .values(active=False)
+    )
 
     # 3. Вычисляем дату истечения, если есть срок
     expires_at = (
@@ -58,7 +78,7 @@ async def subscribe(
 
     # 4. Создаём объект для ORM
     created_form = SubscribeUserCreate(
-        user_id=user.id,
+        user_id=user_id,
         subscription_id=subscription.id,
         expires_at=expires_at,
         source=data.source,
@@ -80,24 +100,32 @@ async def check_user_subscribe(
     session: AsyncSession,
 ) -> bool:
     """
-    💡 Проверяет, есть ли у пользователя активная подписка на указанный тариф.
+    💡 Проверяет, есть ли у пользователя действующая подписка на указанный тариф:
+    активная и не истёкшая (expires_at пуст или в будущем).
+
+    Один запрос: User по chat_id (уникальный индекс) + EXISTS по частичному индексу
+    ix_UserSubscription_entitlement. Тариф проверяется по каталогу, без БД.
 
     Возвращает:
-        True — если активная подписка найдена
-        False — если активной подписки нет
+        True — если действующая подписка найдена
+        False — если действующей подписки нет
+    404 — если нет пользователя или тарифа.
     """
-    user = await get_user_by_chat_id(chat_id=chat_id, session=session)
-    subscription = await CRUD.get(
-        model=Subscription, id=subscription_id, session=session
-    )
+    subscription = await plan_catalog.get(subscription_id)
 
-    stmt = (
-        select(UserSubscription)
-        .where(UserSubscription.user_id == user.id)
-        .where(UserSubscription.subscription_id == subscription.id)
-        .where(UserSubscription.active.is_(True))
+    entitled = exists().where(
+        UserSubscription.user_id == User.id,
+        UserSubscription.subscription_id == subscription.id,
+        UserSubscription.active,
+        _not_expired(),
     )
-
-    result: Result = await session.execute(stmt)
-    existing_sub = result.scalar_one_or_none()
-    return existing_sub is not None
+    row = (
+        await session.execute(select(User.id, entitled).where(User.chat_id == chat_id))
+    ).one_or_none()
+    if row is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
+        )
+    user_id, has_subscription = row
+    user_id_cache.set(chat_id, user_id)
+    return has_subscription
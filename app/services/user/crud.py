@@ -1,9 +1,12 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, Result
 from fastapi import HTTPException, status
+from contracts.bulk import OnConflict
+from contracts.services import UserServiceCreate
 from contracts.user import UserCreateForm, UserCreate
+from core.cache import user_id_cache
 from core.models import User, UserService, Service
-from services.crud import CRUD
+from services.crud import CRUD, loader_options
 from services.error_handlers import DBErrorHandler
 
 
@@ -16,9 +19,31 @@ async def get_user_by_chat_id(chat_id: int, session: AsyncSession) -> User:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
         )
+    user_id_cache.set(chat_id, user[0].id)
     return user[0]
 
 
+async def resolve_user_id(chat_id: int, session: AsyncSession) -> int:
+    """
+    💡 Возвращает User.id по chat_id — без загрузки строки и связей пользователя.
+
+    Сначала смотрит в user_id_cache, иначе выбирает только User.id (индекс по chat_id)
+    и кеширует результат. Для путей, которым нужен лишь id (AMQP-обработчики, проверки).
+    404 — если пользователя нет (отсутствие не кешируется).
+    """
+    user_id = user_id_cache.get(chat_id)
+    if user_id is not None:
+        return user_id
+
+    user_id = await session.scalar(select(User.id).where(User.chat_id == chat_id))
+    if user_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
+        )
+    user_id_cache.set(chat_id, user_id)
+    return user_id
+
+
 async def create_new_user(form: UserCreateForm, session: AsyncSession) -> User:
     """
     Создаёт нового пользователя и привязывает его к сервису (UserService).
@@ -26,7 +51,10 @@ async def create_new_user(form: UserCreateForm, session: AsyncSession) -> User:
     """
     data = form.model_dump(exclude_none=True).copy()
     service: Service = await CRUD.get(
-        model=Service, id=form.service_id, session=session
+        model=Service,
+        id=form.service_id,
+        session=session,
+        options=loader_options(Service),
     )
     user_fields = list(UserCreate.model_fields.keys())
 
@@ -48,4 +76,51 @@ async def create_new_user(form: UserCreateForm, session: AsyncSession) -> User:
     except Exception as err:
         DBErrorHandler.handle(err=err, model=User)
     else:
+        user_id_cache.set(new_user.chat_id, new_user.id)
         return new_user
+
+
+async def create_many_users(
+    forms: list[UserCreateForm],
+    session: AsyncSession,
+    on_conflict: OnConflict = OnConflict.error,
+) -> list[User]:
+    """
+    Массово создаёт пользователей и их связи с сервисами (UserService)
+    двумя INSERT-ами в одной транзакции (см. CRUD.create_many).
+    Конфликты определяются по User.chat_id; уже существующие связи не дублируются.
+    """
+    service_ids = {form.service_id for form in forms}
+    found = set(
+        (await session.scalars(select(Service.id).where(Service.id.in_(service_ids)))).all()
+    )
+    missing = sorted(service_ids - found)
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Service with id={', '.join(map(str, missing))} not found.",
+        )
+
+    users = await CRUD.create_many(
+        data=[UserCreate.model_validate(form.model_dump()) for form in forms],
+        model=User,
+        session=session,
+        on_conflict=on_conflict,
+        commit=False,
+    )
+    user_ids = {user.chat_id: user.id for user in users}
+    links = [
+        UserServiceCreate(user_id=user_ids[form.chat_id], service_id=form.service_id)
+        for form in forms
+        if form.chat_id in user_ids
+    ]
+    await CRUD.create_many(
+        data=links,
+        model=UserService,
+        session=session,
+        on_conflict=OnConflict.nothing,
+        conflict_keys=("user_id", "service_id"),
+    )
+    for chat_id, user_id in user_ids.items():
+        user_id_cache.set(chat_id, user_id)
+    return users